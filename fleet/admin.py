@@ -1,6 +1,74 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Vehicle, Driver, Trip, Expense, MaintenanceLog
+from django.db.models import Q
+from .models import User, Vehicle, Driver, Trip, Expense, MaintenanceLog, FleetEvent, Location, ExpenseAnomaly
+from . import bulk
+from .pagination import EstimatedCountPaginator
+
+
+def _report(modeladmin, request, done, skipped, outcome, skip_reason):
+    opts = modeladmin.model._meta
+    noun = opts.verbose_name if done == 1 else opts.verbose_name_plural
+    modeladmin.message_user(request, f'{done} {noun} {outcome}.', messages.SUCCESS)
+    if skipped:
+        modeladmin.message_user(request, f'{skipped} skipped: {skip_reason}.', messages.WARNING)
+
+
+def _vehicle_status_action(status):
+    @admin.action(description=f'Set selected vehicles to {status.label}', permissions=['change'])
+    def action(modeladmin, request, queryset):
+        done, skipped = bulk.set_vehicle_status(queryset, status, request.user)
+        _report(modeladmin, request, done, skipped, f'set to {status.label}', 'vehicles on a trip')
+    action.__name__ = f'set_{status.lower()}'
+    return action
+
+
+def _driver_status_action(status):
+    @admin.action(description=f'Set selected drivers to {status.label}', permissions=['change'])
+    def action(modeladmin, request, queryset):
+        done, skipped = bulk.set_driver_status(queryset, status, request.user)
+        _report(modeladmin, request, done, skipped, f'set to {status.label}', '')
+    action.__name__ = f'set_{status.lower()}'
+    return action
+
+
+@admin.action(description='Cancel selected trips', permissions=['change'])
+def cancel_trips(modeladmin, request, queryset):
+    done, skipped = bulk.cancel_trips(queryset, request.user)
+    _report(modeladmin, request, done, skipped, 'cancelled', 'only draft and dispatched trips can be cancelled')
+
+
+@admin.action(description='Mark selected maintenance complete', permissions=['change'])
+def complete_maintenance(modeladmin, request, queryset):
+    done, skipped = bulk.complete_maintenance(queryset, request.user)
+    _report(modeladmin, request, done, skipped, 'marked complete', 'already completed')
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables that grow to millions of rows.
+
+    ``search_fields`` name exact natural keys on related rows (e.g.
+    ``vehicle__license_plate``). Each becomes ``fk IN (SELECT id ... WHERE
+    key = term)``, one unique-index lookup plus one FK-index lookup, instead
+    of an OR across joins that scans the whole table.
+
+    Dates are narrowed with a date ``list_filter`` (ranges on an indexed
+    column) rather than ``date_hierarchy``, whose year/month links come from
+    a DISTINCT over the whole table on every page load.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    def get_search_results(self, request, queryset, search_term):
+        for term in search_term.split():
+            matches = Q()
+            for path in self.search_fields:
+                relation, key = path.split('__', 1)
+                related = self.model._meta.get_field(relation).related_model
+                matches |= Q(**{f'{relation}__in': related.objects.filter(**{key: term}).values('pk')})
+            queryset = queryset.filter(matches)
+        return queryset, False
 
 
 @admin.register(User)
@@ -16,24 +84,78 @@ class UserAdmin(BaseUserAdmin):
 class VehicleAdmin(admin.ModelAdmin):
     list_display = ('name', 'license_plate', 'vehicle_type', 'max_load_capacity', 'odometer', 'status')
     list_filter = ('vehicle_type', 'status')
+    search_fields = ('^name', '=license_plate')
+    actions = [_vehicle_status_action(status) for status in bulk.VEHICLE_STATUSES]
 
 
 @admin.register(Driver)
 class DriverAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'license_number', 'license_expiry', 'status', 'safety_score')
+    list_filter = ('status',)
+    search_fields = ('^name', '=license_number', '=email')
+    actions = [_driver_status_action(status) for status in Driver.Status]
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'normalized_name', 'latitude', 'longitude')
+    search_fields = ('^normalized_name',)
+    readonly_fields = ('normalized_name',)
 
 
 @admin.register(Trip)
-class TripAdmin(admin.ModelAdmin):
-    list_display = ('origin', 'destination', 'vehicle', 'driver', 'status', 'cargo_weight')
-    list_filter = ('status',)
+class TripAdmin(LargeTableAdmin):
+    list_display = ('origin', 'destination', 'vehicle', 'driver', 'status', 'cargo_weight', 'created_at')
+    list_filter = ('status', 'created_at')
+    list_select_related = ('vehicle', 'driver')
+    search_fields = ('vehicle__license_plate', 'driver__license_number')
+    search_help_text = 'Exact license plate or driver license number'
+    autocomplete_fields = ('vehicle', 'driver', 'origin_location', 'destination_location')
+    actions = [cancel_trips]
 
 
 @admin.register(Expense)
-class ExpenseAdmin(admin.ModelAdmin):
+class ExpenseAdmin(LargeTableAdmin):
     list_display = ('vehicle', 'expense_type', 'amount', 'liters', 'date')
+    list_filter = ('expense_type', 'date')
+    list_select_related = ('vehicle',)
+    search_fields = ('vehicle__license_plate',)
+    search_help_text = 'Exact license plate'
+    autocomplete_fields = ('vehicle',)
+    raw_id_fields = ('trip',)
+
+
+@admin.register(ExpenseAnomaly)
+class ExpenseAnomalyAdmin(LargeTableAdmin):
+    list_display = ('expense', 'score', 'reasons', 'updated_at')
+    list_select_related = ('expense__vehicle',)
+    search_fields = ('expense__vehicle__license_plate',)
+    search_help_text = 'Exact license plate'
+    raw_id_fields = ('expense',)
 
 
 @admin.register(MaintenanceLog)
-class MaintenanceLogAdmin(admin.ModelAdmin):
+class MaintenanceLogAdmin(LargeTableAdmin):
     list_display = ('vehicle', 'service_type', 'description', 'cost', 'date', 'completed_at')
+    list_filter = ('service_type', 'date')
+    list_select_related = ('vehicle',)
+    search_fields = ('vehicle__license_plate',)
+    search_help_text = 'Exact license plate'
+    autocomplete_fields = ('vehicle',)
+    actions = [complete_maintenance]
+
+
+@admin.register(FleetEvent)
+class FleetEventAdmin(LargeTableAdmin):
+    list_display = ('occurred_at', 'entity_type', 'entity_id', 'from_status', 'to_status', 'actor')
+    list_filter = ('entity_type', 'to_status')
+    list_select_related = ('actor',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
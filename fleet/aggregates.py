@@ -0,0 +1,33 @@
+"""
+Exact aggregates over the fixed-point money and measurement columns.
+
+PostgreSQL sums ``numeric`` exactly, but SQLite stores every ``DecimalField``
+as a REAL, so a plain ``Sum('amount')`` over millions of receipts picks up
+binary rounding error. ``DecimalSum`` scales each value to integer minor
+units (cents, grams, ...) inside the query on SQLite, sums those - exact up
+to 2**53 minor units - and scales the total back in Python.
+"""
+from decimal import Decimal
+
+from django.db.models import Sum
+
+
+class DecimalSum(Sum):
+    """``Sum`` of a ``DecimalField`` that is exact on every backend"""
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        scale = 10 ** self.output_field.decimal_places
+        clone = self.copy()
+        clone.template = f'%(function)s(%(distinct)sROUND(%(expressions)s * {scale}))'
+        return clone.as_sql(compiler, connection, **extra_context)
+
+    def get_db_converters(self, connection):
+        converters = super().get_db_converters(connection)
+        if connection.vendor == 'sqlite':
+            converters.append(self._from_minor_units)
+        return converters
+
+    def _from_minor_units(self, value, expression, connection):
+        if value is None:
+            return value
+        return Decimal(value).scaleb(-self.output_field.decimal_places)
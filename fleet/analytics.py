@@ -0,0 +1,149 @@
+"""
+Per-vehicle analytics shared by the reports page and the CSV/PDF exports.
+
+Costs and completed-trip counts come from one grouped query each rather
+than two queries per vehicle, plus the archive rollups so history moved
+out by ``archive_history`` is still counted. Lane figures group hot and
+archived trips by their normalized origin/destination ``Location`` pair.
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, OuterRef, Subquery
+from django.utils import timezone
+
+from .aggregates import DecimalSum
+from .models import Vehicle, Trip, Expense, Location, ArchivedTrip, ArchivedExpense, VehicleArchiveRollup
+from .utilization import vehicle_utilization, fleet_utilization
+
+
+OPERATIONAL_EXPENSE_TYPES = [Expense.Type.FUEL, Expense.Type.MAINTENANCE, Expense.Type.REPAIR]
+DEFAULT_RANGE_DAYS = 30
+DEFAULT_LANE_LIMIT = 20
+
+
+def report_range(params):
+    """(start_date, end_date) from ``?start=YYYY-MM-DD&end=YYYY-MM-DD``, default last 30 days"""
+    today = timezone.localdate()
+    try:
+        end = datetime.strptime(params.get('end', ''), '%Y-%m-%d').date()
+    except ValueError:
+        end = today
+    try:
+        start = datetime.strptime(params.get('start', ''), '%Y-%m-%d').date()
+    except ValueError:
+        start = end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        start, end = end, start
+    return start, end
+
+
+def _bounds(start_date, end_date):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def vehicle_analytics(start_date, end_date):
+    """Rows of cost, completed trips, odometer and utilization per vehicle.
+
+    Returns ``(rows, fleet_utilization_pct)``; utilization covers the given
+    inclusive date range, cost and trip counts are all-time as before.
+    """
+    costs = dict(
+        Expense.objects.order_by()
+        .filter(expense_type__in=OPERATIONAL_EXPENSE_TYPES)
+        .values_list('vehicle_id')
+        .annotate(total=DecimalSum('amount'))
+    )
+    completed = dict(
+        Trip.objects.order_by()
+        .filter(status=Trip.Status.COMPLETED)
+        .values_list('vehicle_id')
+        .annotate(n=Count('id'))
+    )
+    archived = {
+        vehicle_id: (completed_trips, operational_cost)
+        for vehicle_id, completed_trips, operational_cost in VehicleArchiveRollup.objects.values_list(
+            'vehicle_id', 'completed_trips', 'operational_cost'
+        )
+    }
+    utilization = vehicle_utilization(*_bounds(start_date, end_date))
+
+    vehicles = Vehicle.objects.only('name', 'vehicle_type', 'status', 'odometer', 'updated_at')
+    rows = [
+        {
+            'vehicle': vehicle,
+            'total_operational_cost': (costs.get(vehicle.id) or 0) + archived.get(vehicle.id, (0, 0))[1],
+            'completed_trips': completed.get(vehicle.id, 0) + archived.get(vehicle.id, (0, 0))[0],
+            'odometer': vehicle.odometer,
+            'utilization': utilization.get(vehicle.id, 0),
+        }
+        for vehicle in vehicles
+    ]
+    return rows, fleet_utilization(utilization, len(rows))
+
+
+def lane_analytics(start_date, end_date, limit=DEFAULT_LANE_LIMIT):
+    """Trips, tonnage and expense cost per origin -> destination lane, archived trips included.
+
+    Trips and their expenses are grouped by lane in separate queries, so
+    joining expenses does not double-count tonnage, once for the hot tables
+    and once for the archive; the results are merged here.
+    """
+    start, end = _bounds(start_date, end_date)
+    trips = (
+        Trip.objects.order_by()
+        .filter(created_at__gte=start, created_at__lt=end, origin_location__isnull=False)
+        .exclude(status=Trip.Status.CANCELLED)
+    )
+    archived = (
+        ArchivedTrip.objects.order_by()
+        .filter(created_at__gte=start, created_at__lt=end, origin_location_id__isnull=False)
+        .exclude(status=Trip.Status.CANCELLED)
+    )
+
+    counts, tonnage, cost = Counter(), Counter(), Counter()
+    for rows in (
+        trips.values_list('origin_location', 'destination_location')
+        .annotate(n=Count('id'), weight=DecimalSum('cargo_weight')),
+        archived.values_list('origin_location_id', 'destination_location_id')
+        .annotate(n=Count('id'), weight=DecimalSum('cargo_weight')),
+    ):
+        for origin, destination, n, weight in rows:
+            counts[origin, destination] += n
+            tonnage[origin, destination] += weight
+
+    archived_lane = ArchivedTrip.objects.filter(pk=OuterRef('trip_id'))
+    for rows in (
+        Expense.objects.order_by().filter(trip__in=trips)
+        .values_list('trip__origin_location', 'trip__destination_location')
+        .annotate(total=DecimalSum('amount')),
+        ArchivedExpense.objects.order_by().filter(trip_id__in=archived.values('id'))
+        .annotate(
+            origin=Subquery(archived_lane.values('origin_location_id')),
+            destination=Subquery(archived_lane.values('destination_location_id')),
+        )
+        .values_list('origin', 'destination')
+        .annotate(total=DecimalSum('amount')),
+    ):
+        for origin, destination, total in rows:
+            cost[origin, destination] += total
+
+    names = dict(Location.objects.filter(pk__in={pk for lane in counts for pk in lane}).values_list('pk', 'name'))
+    lanes = [
+        {
+            'origin_location': origin,
+            'destination_location': destination,
+            'origin_name': names.get(origin, ''),
+            'destination_name': names.get(destination, ''),
+            'trips': counts[origin, destination],
+            'tonnage': tonnage[origin, destination],
+            'cost': cost.get((origin, destination), Decimal(0)),
+        }
+        for origin, destination in counts
+    ]
+    lanes.sort(key=lambda lane: (-lane['trips'], lane['origin_name'], lane['destination_name']))
+    return lanes[:limit]
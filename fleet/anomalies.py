@@ -0,0 +1,191 @@
+"""
+Fuel expense anomaly detection.
+
+Every fuel expense is compared with the same vehicle's previous
+``WINDOW`` fuel expenses on two ratios:
+
+* cost per liter (``amount / liters``), which catches padded receipts and
+  typos in either field, and
+* liters per km over the linked trip's odometer delta, which catches fuel
+  that never went into the vehicle.
+
+The baseline is the rolling median, and the spread is the median absolute
+deviation (MAD). The score is the larger robust z-score
+``|x - median| / (1.4826 * MAD)`` of the two ratios. Rows scoring at least
+``THRESHOLD`` get an ``ExpenseAnomaly``.
+
+All rows are sorted by vehicle and date into flat NumPy arrays. Each row's
+window of earlier rows is gathered with one fancy-indexing step per chunk,
+so the whole table is scored without a Python loop per expense. Runs are
+incremental: only expenses changed since the last ``AnomalyScan`` are
+rescored, against their vehicles' full history. The scan stops
+``CHANGE_FEED_SETTLE_SECONDS`` short of now, so expenses written by a
+transaction still in flight (e.g. a sync batch) are scored by the next run
+rather than skipped.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from .caching import bump_table_version
+from .models import Expense, ExpenseAnomaly, AnomalyScan
+
+
+WINDOW = 30
+MIN_HISTORY = 10
+THRESHOLD = 5.0
+# Floor for the spread, as a share of the median, so a perfectly steady price does not divide by zero
+MIN_RELATIVE_SPREAD = 0.05
+CHUNK_ROWS = 100_000
+
+
+def _load(queryset):
+    """Sorted column arrays for the fuel expenses in ``queryset``"""
+    rows = list(
+        queryset.filter(expense_type=Expense.Type.FUEL)
+        .order_by('vehicle_id', 'date', 'id')
+        .values_list('id', 'vehicle_id', 'amount', 'liters', 'trip__start_odometer', 'trip__end_odometer')
+        .iterator(chunk_size=10_000)
+    )
+    if not rows:
+        return None
+    ids, vehicles, amounts, liters, starts, ends = zip(*rows)
+    return {
+        'id': np.array(ids, dtype=np.int64),
+        'vehicle': np.array(vehicles, dtype=np.int64),
+        'amount': _floats(amounts),
+        'liters': _floats(liters),
+        'distance': _floats(ends) - _floats(starts),
+    }
+
+
+def _floats(values):
+    return np.array([np.nan if value is None else float(value) for value in values])
+
+
+def _group_starts(vehicles):
+    """Index of the first row of each row's vehicle"""
+    starts = np.zeros(len(vehicles), dtype=np.int64)
+    boundaries = np.flatnonzero(np.diff(vehicles)) + 1
+    starts[boundaries] = boundaries
+    return np.maximum.accumulate(starts)
+
+
+def _row_medians(matrix):
+    """Median of the non-NaN values in each row (NaN for empty rows).
+
+    Sorting pushes NaNs to the end of each row, so the median sits at a
+    per-row index; this is several times faster than ``np.nanmedian``.
+    """
+    ordered = np.sort(matrix, axis=1)
+    counts = np.count_nonzero(~np.isnan(ordered), axis=1)
+    rows = np.arange(len(ordered))
+    low = ordered[rows, np.maximum((counts - 1) // 2, 0)]
+    high = ordered[rows, counts // 2]
+    return np.where(counts > 0, (low + high) / 2, np.nan), counts
+
+
+def rolling_robust_z(values, group_starts, window=WINDOW, min_history=MIN_HISTORY):
+    """(z, median) of each value against the previous ``window`` values of its group"""
+    n = len(values)
+    z = np.full(n, np.nan)
+    medians = np.full(n, np.nan)
+    offsets = np.arange(-window, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for lo in range(0, n, CHUNK_ROWS):
+            rows = np.arange(lo, min(lo + CHUNK_ROWS, n))
+            columns = rows[:, None] + offsets
+            history = np.where(columns >= group_starts[rows][:, None], values[np.maximum(columns, 0)], np.nan)
+            median, counts = _row_medians(history)
+            mad, _ = _row_medians(np.abs(history - median[:, None]))
+            spread = np.maximum(1.4826 * mad, MIN_RELATIVE_SPREAD * np.abs(median))
+            enough = counts >= min_history
+            z[rows] = np.where(enough, np.abs(values[rows] - median) / spread, np.nan)
+            medians[rows] = np.where(enough, median, np.nan)
+    return z, medians
+
+
+def score(columns):
+    """(score, reasons) arrays for sorted fuel expense ``columns``"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cost_per_liter = np.where(columns['liters'] > 0, columns['amount'] / columns['liters'], np.nan)
+        liters_per_km = np.where(columns['distance'] > 0, columns['liters'] / columns['distance'], np.nan)
+    starts = _group_starts(columns['vehicle'])
+    price_z, price_median = rolling_robust_z(cost_per_liter, starts)
+    usage_z, usage_median = rolling_robust_z(liters_per_km, starts)
+
+    total = np.fmax(price_z, usage_z)
+    reasons = []
+    for i in np.flatnonzero(total >= THRESHOLD):
+        parts = []
+        if price_z[i] >= THRESHOLD:
+            parts.append(f'{cost_per_liter[i]:.2f}/L vs usual {price_median[i]:.2f}/L')
+        if usage_z[i] >= THRESHOLD:
+            parts.append(f'{liters_per_km[i] * 100:.1f} L/100km vs usual {usage_median[i] * 100:.1f}')
+        reasons.append((i, '; '.join(parts)))
+    return total, reasons
+
+
+def _save(rescored, columns=None, targets=None, total=None, reasons=()):
+    """Replace the anomalies of the ``rescored`` expenses with the flagged rows among ``targets``"""
+    flagged = [
+        ExpenseAnomaly(expense_id=int(columns['id'][i]), score=float(total[i]), reasons=text)
+        for i, text in reasons if targets[i]
+    ]
+    with transaction.atomic():
+        ExpenseAnomaly.objects.filter(expense__in=rescored).delete()
+        ExpenseAnomaly.objects.bulk_create(flagged, batch_size=1000)
+    # One bump instead of a post_delete signal per row keeps the delete set-based
+    bump_table_version(ExpenseAnomaly)
+    return len(flagged)
+
+
+def detect(full=False):
+    """Score fuel expenses changed since the last scan (all of them with ``full``).
+
+    Returns the new ``AnomalyScan``.
+    """
+    last = None if full else AnomalyScan.objects.first()
+    since = last.scored_through if last else None
+    # Rows younger than the settle lag may belong to uncommitted transactions; the next run takes them
+    settled = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+    until = Expense.objects.filter(updated_at__lte=settled).aggregate(latest=Max('updated_at'))['latest']
+
+    changed = Expense.objects.filter(updated_at__lte=until or settled)
+    if since is not None:
+        changed = changed.filter(updated_at__gt=since)
+    changed_ids = np.fromiter(changed.values_list('id', flat=True).iterator(), dtype=np.int64)
+
+    scored = flagged = 0
+    if len(changed_ids):
+        columns = _load(Expense.objects.filter(vehicle_id__in=changed.values('vehicle_id')))
+        if columns is None:
+            # Only non-fuel rows changed; any flag they carried as fuel expenses goes
+            _save(changed)
+        else:
+            targets = np.isin(columns['id'], changed_ids)
+            total, reasons = score(columns)
+            scored = int(targets.sum())
+            flagged = _save(changed, columns, targets, total, reasons)
+
+    return AnomalyScan.objects.create(scored_through=until or since, scored=scored, flagged=flagged)
+
+
+def score_expense(expense):
+    """Score one new fuel expense against its vehicle's last ``WINDOW`` fuel expenses"""
+    if expense.expense_type != Expense.Type.FUEL:
+        return None
+    history = (
+        Expense.objects.filter(vehicle_id=expense.vehicle_id, expense_type=Expense.Type.FUEL, date__lte=expense.date)
+        .exclude(pk=expense.pk)
+        .order_by('-date', '-id')
+        .values_list('id', flat=True)[:WINDOW]
+    )
+    columns = _load(Expense.objects.filter(id__in=[*history, expense.pk]))
+    targets = columns['id'] == expense.pk
+    total, reasons = score(columns)
+    _save(Expense.objects.filter(pk=expense.pk), columns, targets, total, reasons)
+    return ExpenseAnomaly.objects.filter(expense=expense).first()
@@ -0,0 +1,148 @@
+"""
+Time-based archiving of finished trips and old expenses.
+
+COMPLETED/CANCELLED trips that ended before a cutoff move, together with
+their expenses, from ``Trip``/``Expense`` into ``ArchivedTrip``/
+``ArchivedExpense``. Standalone expenses older than the cutoff move too.
+Each chunk is copied, rolled up and deleted in its own transaction so the
+hot tables are never locked for long and an interrupted run simply resumes.
+
+Reports stay complete because every chunk also adds its totals to
+``VehicleArchiveRollup``/``DriverArchiveRollup``, which the analytics and
+driver completion-rate code add back in.
+
+The deletes run under ``signals.archiving()``, so the per-row delete
+receivers stand aside: archived rows leave no tombstone in the change feed,
+and each chunk bumps the page-ETag counters and drops its trips' search
+entries once.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import search
+from .analytics import OPERATIONAL_EXPENSE_TYPES
+from .caching import bump_table_version
+from .models import (
+    Trip, Expense, ArchivedTrip, ArchivedExpense, VehicleArchiveRollup, DriverArchiveRollup,
+)
+from .signals import archiving
+
+
+DEFAULT_BATCH_SIZE = 1000
+TRIP_FIELDS = [f.attname for f in Trip._meta.concrete_fields]
+EXPENSE_FIELDS = [f.attname for f in Expense._meta.concrete_fields]
+
+
+def archivable_trips(cutoff):
+    """Finished trips whose end (or, for cancellations, last update) is before ``cutoff``"""
+    return Trip.objects.filter(status__in=[Trip.Status.COMPLETED, Trip.Status.CANCELLED]).filter(
+        Q(end_date__lt=cutoff) | Q(end_date__isnull=True, updated_at__lt=cutoff)
+    )
+
+
+def archivable_expenses(cutoff):
+    """Expenses not tied to a trip and dated before ``cutoff``"""
+    return Expense.objects.filter(trip__isnull=True, date__lt=cutoff)
+
+
+def _update_rollups(trips, expenses):
+    now = timezone.now()
+    vehicles = defaultdict(lambda: [0, 0, Decimal(0), Decimal(0)])
+    drivers = defaultdict(lambda: [0, 0])
+    for trip in trips:
+        completed = trip['status'] == Trip.Status.COMPLETED
+        vehicles[trip['vehicle_id']][0] += 1
+        vehicles[trip['vehicle_id']][1] += completed
+        drivers[trip['driver_id']][0] += 1
+        drivers[trip['driver_id']][1] += completed
+    for expense in expenses:
+        if expense['expense_type'] in OPERATIONAL_EXPENSE_TYPES:
+            vehicles[expense['vehicle_id']][2] += expense['amount']
+        if expense['expense_type'] == Expense.Type.FUEL:
+            vehicles[expense['vehicle_id']][3] += expense['amount']
+
+    VehicleArchiveRollup.objects.bulk_create(
+        [VehicleArchiveRollup(vehicle_id=pk) for pk in vehicles], ignore_conflicts=True
+    )
+    for pk, (archived, completed, cost, fuel) in vehicles.items():
+        VehicleArchiveRollup.objects.filter(vehicle_id=pk).update(
+            archived_trips=F('archived_trips') + archived,
+            completed_trips=F('completed_trips') + completed,
+            operational_cost=F('operational_cost') + cost,
+            fuel_cost=F('fuel_cost') + fuel,
+            updated_at=now,
+        )
+
+    DriverArchiveRollup.objects.bulk_create(
+        [DriverArchiveRollup(driver_id=pk) for pk in drivers], ignore_conflicts=True
+    )
+    for pk, (archived, completed) in drivers.items():
+        DriverArchiveRollup.objects.filter(driver_id=pk).update(
+            archived_trips=F('archived_trips') + archived,
+            completed_trips=F('completed_trips') + completed,
+            updated_at=now,
+        )
+
+
+@transaction.atomic
+def archive_trip_batch(trip_ids):
+    """Move the given trips and all their expenses to the archive tables"""
+    trips = list(Trip.objects.filter(pk__in=trip_ids).values(*TRIP_FIELDS))
+    expenses = list(Expense.objects.filter(trip_id__in=trip_ids).values(*EXPENSE_FIELDS))
+
+    ArchivedTrip.objects.bulk_create([ArchivedTrip(**row) for row in trips])
+    ArchivedExpense.objects.bulk_create([ArchivedExpense(**row) for row in expenses])
+    _update_rollups(trips, expenses)
+
+    trip_ids = [row['id'] for row in trips]
+    with archiving():
+        Expense.objects.filter(pk__in=[row['id'] for row in expenses]).delete()
+        Trip.objects.filter(pk__in=trip_ids).delete()
+    if expenses:
+        bump_table_version(Expense)
+    if trips:
+        bump_table_version(Trip)
+        search.unindex_ids(Trip, trip_ids)
+    return len(trips), len(expenses)
+
+
+@transaction.atomic
+def archive_expense_batch(expense_ids):
+    """Move the given standalone expenses to the archive table"""
+    expenses = list(Expense.objects.filter(pk__in=expense_ids).values(*EXPENSE_FIELDS))
+    ArchivedExpense.objects.bulk_create([ArchivedExpense(**row) for row in expenses])
+    _update_rollups([], expenses)
+    with archiving():
+        Expense.objects.filter(pk__in=[row['id'] for row in expenses]).delete()
+    if expenses:
+        bump_table_version(Expense)
+    return len(expenses)
+
+
+def archive_before(cutoff, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Archive everything older than ``cutoff`` in chunks; returns (trips, expenses) moved"""
+    trips_moved = expenses_moved = 0
+
+    while True:
+        ids = list(archivable_trips(cutoff).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        trips, expenses = archive_trip_batch(ids)
+        trips_moved += trips
+        expenses_moved += expenses
+        if progress:
+            progress(trips_moved, expenses_moved)
+
+    while True:
+        ids = list(archivable_expenses(cutoff).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        expenses_moved += archive_expense_batch(ids)
+        if progress:
+            progress(trips_moved, expenses_moved)
+
+    return trips_moved, expenses_moved
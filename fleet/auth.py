@@ -0,0 +1,65 @@
+"""
+Authentication backend with a cached user lookup.
+
+``AuthenticationMiddleware`` resolves ``request.user`` on every
+``@login_required`` request, which costs one ``SELECT`` on the user table.
+The backend below serves that row from the cache instead; the entry is
+dropped by a signal whenever the user is saved or deleted (role change,
+password change, deactivation), so stale permissions never outlive a save.
+
+That only holds when every worker reads the same cache. With a per-process
+cache (locmem, the default without ``CACHE_URL``) an invalidation in one
+worker leaves other workers serving the old row, so the backend falls back to
+a plain DB lookup, and ``manage.py check`` warns about it outside DEBUG.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.checks import Warning, register
+
+
+USER_CACHE_KEY = 'fleetflow:user:{}'
+
+# Cache backends whose entries are not visible to other worker processes
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def user_cache_is_shared():
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose ``get_user`` is served from the default cache when it is shared"""
+
+    def get_user(self, user_id):
+        if not user_cache_is_shared():
+            return super().get_user(user_id)
+        key = USER_CACHE_KEY.format(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+
+@register()
+def check_user_cache(app_configs, **kwargs):
+    backend = f'{CachedModelBackend.__module__}.{CachedModelBackend.__qualname__}'
+    if settings.DEBUG or backend not in settings.AUTHENTICATION_BACKENDS or user_cache_is_shared():
+        return []
+    return [
+        Warning(
+            'CachedModelBackend is configured but the default cache is process-local; '
+            'users are loaded from the database on every request.',
+            hint='Set CACHE_URL to a shared cache (e.g. redis://) to serve users from the cache.',
+            id='fleet.W001',
+        )
+    ]
@@ -0,0 +1,153 @@
+"""
+Bulk status changes and deletes for the list views and the admin.
+
+Each operation applies the rules of the matching single-item view to a
+whole selection at once. The selected rows are read (and locked) with one
+``SELECT``, changed with set-based ``UPDATE``s in chunks of ``batch_size``
+ids, and their status events written with one ``INSERT``, all inside one
+transaction. ``update()`` skips ``auto_now``, so ``updated_at`` is set
+explicitly to keep page ETags and row caches honest.
+
+Every operation returns ``(changed, skipped)``, where skipped rows are the
+selected ones the business rules left alone.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import events
+from .models import Vehicle, Driver, Trip, MaintenanceLog, FleetEvent
+
+
+DEFAULT_BATCH_SIZE = 500
+# ON_TRIP is owned by dispatch / complete / cancel
+VEHICLE_STATUSES = (Vehicle.Status.AVAILABLE, Vehicle.Status.IN_SHOP, Vehicle.Status.OUT_OF_SERVICE)
+CANCELLABLE_TRIP_STATUSES = (Trip.Status.DRAFT, Trip.Status.DISPATCHED)
+
+
+def _chunks(ids, batch_size):
+    ids = list(ids)
+    for start in range(0, len(ids), batch_size):
+        yield ids[start:start + batch_size]
+
+
+def _update(model, ids, batch_size, **fields):
+    for chunk in _chunks(ids, batch_size):
+        model.objects.filter(pk__in=chunk).update(**fields)
+
+
+def set_vehicle_status(vehicles, status, actor=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Move ``vehicles`` to ``status``, skipping vehicles on a trip.
+
+    ``is_out_of_service`` follows the new status, so vehicles moved to
+    ``OUT_OF_SERVICE`` drop out of trip assignment and vehicles moved back
+    return to it.
+    """
+    if status not in VEHICLE_STATUSES:
+        raise ValueError(f'Vehicles cannot be bulk-moved to {status}')
+    now = timezone.now()
+    fields = {
+        'status': status,
+        'is_out_of_service': status == Vehicle.Status.OUT_OF_SERVICE,
+        'updated_at': now,
+    }
+
+    with transaction.atomic():
+        rows = list(vehicles.order_by().select_for_update().values_list('pk', 'status'))
+        movable = [(pk, previous) for pk, previous in rows if previous != Vehicle.Status.ON_TRIP]
+        _update(Vehicle, [pk for pk, _ in movable], batch_size, **fields)
+        events.record_all(
+            events.transition(FleetEvent.EntityType.VEHICLE, pk, previous, status, actor, at=now)
+            for pk, previous in movable
+        )
+    return len(movable), len(rows) - len(movable)
+
+
+def set_driver_status(drivers, status, actor=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Move ``drivers`` to ``status`` (e.g. suspend a contractor's drivers)"""
+    if status not in Driver.Status.values:
+        raise ValueError(f'Unknown driver status {status}')
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = list(drivers.order_by().select_for_update().values_list('pk', 'status'))
+        _update(Driver, [pk for pk, _ in rows], batch_size, status=status, updated_at=now)
+        events.record_all(
+            events.transition(FleetEvent.EntityType.DRIVER, pk, previous, status, actor, at=now)
+            for pk, previous in rows
+        )
+    return len(rows), 0
+
+
+def _delete_unused(queryset, model):
+    """Delete the rows of ``queryset`` that no trip references (trips PROTECT them)"""
+    with transaction.atomic():
+        selected = queryset.count()
+        unused = queryset.filter(~Exists(Trip.objects.filter(**{model._meta.model_name: OuterRef('pk')})))
+        _, deleted = unused.delete()
+    removed = deleted.get(model._meta.label, 0)
+    return removed, selected - removed
+
+
+def delete_vehicles(vehicles):
+    """Delete ``vehicles`` with their expenses and maintenance logs, keeping any with trips"""
+    return _delete_unused(vehicles, Vehicle)
+
+
+def delete_drivers(drivers):
+    """Delete ``drivers``, keeping any with trips"""
+    return _delete_unused(drivers, Driver)
+
+
+def cancel_trips(trips, actor=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Cancel the draft and dispatched ``trips``; dispatched ones release their vehicle and driver"""
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = list(
+            trips.order_by().select_for_update()
+            .values_list('pk', 'status', 'vehicle_id', 'vehicle__status', 'driver_id', 'driver__status')
+        )
+        cancelled = [row for row in rows if row[1] in CANCELLABLE_TRIP_STATUSES]
+        released_vehicles = {row[2]: row[3] for row in cancelled if row[1] == Trip.Status.DISPATCHED}
+        released_drivers = {row[4]: row[5] for row in cancelled if row[1] == Trip.Status.DISPATCHED}
+
+        _update(Trip, [row[0] for row in cancelled], batch_size, status=Trip.Status.CANCELLED, updated_at=now)
+        _update(Vehicle, released_vehicles, batch_size, status=Vehicle.Status.AVAILABLE, updated_at=now)
+        _update(Driver, released_drivers, batch_size, status=Driver.Status.OFF_DUTY, updated_at=now)
+
+        changes = [
+            events.transition(FleetEvent.EntityType.TRIP, pk, previous, Trip.Status.CANCELLED, actor, at=now)
+            for pk, previous, *_ in cancelled
+        ]
+        changes += [
+            events.transition(FleetEvent.EntityType.VEHICLE, pk, previous, Vehicle.Status.AVAILABLE, actor, at=now)
+            for pk, previous in released_vehicles.items()
+        ]
+        changes += [
+            events.transition(FleetEvent.EntityType.DRIVER, pk, previous, Driver.Status.OFF_DUTY, actor, at=now)
+            for pk, previous in released_drivers.items()
+        ]
+        events.record_all(changes)
+    return len(cancelled), len(rows) - len(cancelled)
+
+
+def complete_maintenance(logs, actor=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Complete the open ``logs``; vehicles left with no open maintenance become available"""
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = list(logs.order_by().select_for_update().values_list('pk', 'vehicle_id', 'completed_at'))
+        open_rows = [(pk, vehicle_id) for pk, vehicle_id, completed_at in rows if completed_at is None]
+        _update(MaintenanceLog, [pk for pk, _ in open_rows], batch_size, completed_at=now, updated_at=now)
+
+        pending = MaintenanceLog.objects.filter(vehicle=OuterRef('pk'), completed_at__isnull=True)
+        released = []
+        for chunk in _chunks({vehicle_id for _, vehicle_id in open_rows}, batch_size):
+            released += Vehicle.objects.filter(pk__in=chunk).exclude(Exists(pending)).values_list('pk', 'status')
+        _update(Vehicle, [pk for pk, _ in released], batch_size, status=Vehicle.Status.AVAILABLE, updated_at=now)
+        events.record_all(
+            events.transition(FleetEvent.EntityType.VEHICLE, pk, previous, Vehicle.Status.AVAILABLE, actor, at=now)
+            for pk, previous in released
+        )
+    return len(open_rows), len(rows) - len(open_rows)
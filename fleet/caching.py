@@ -0,0 +1,108 @@
+"""
+Fragment, page and HTTP validator cache helpers.
+
+List and report rows are cached with ``{% cache %}`` keyed on the row's
+``pk`` and ``updated_at`` plus the ``updated_at`` of every related row it
+displays (e.g. a trip's vehicle and driver). Saving any of them changes the
+key, in every worker, without an invalidation step.
+
+Deletes do not move ``max(updated_at)``, so page ETags also include a
+per-table delete counter. The counters live in the ``TableVersion`` table,
+bumped in the deleting transaction, so every worker, management command and
+bulk delete moves the same counter and an eviction cannot reset it.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db.models import F, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import TableVersion
+
+
+PAGE_KEY = 'fleetflow:page:{}'
+
+
+# ==================== CONDITIONAL GET ====================
+def table_versions(models):
+    """Delete counter of each model (0 until its first delete) - one query"""
+    labels = [model._meta.label_lower for model in models]
+    found = dict(TableVersion.objects.filter(table__in=labels).values_list('table', 'version'))
+    return [found.get(label, 0) for label in labels]
+
+
+def bump_table_version(model):
+    """Count a delete of ``model`` rows; runs in the deleting transaction"""
+    rows = TableVersion.objects.filter(table=model._meta.label_lower)
+    if not rows.update(version=F('version') + 1):
+        _, created = TableVersion.objects.get_or_create(table=model._meta.label_lower)
+        if not created:
+            # Another transaction created the row first
+            rows.update(version=F('version') + 1)
+
+
+def _change_state(models):
+    """(max updated_at, delete counter) per model - one indexed lookup each plus one for the counters"""
+    return list(zip(
+        [model.objects.order_by().aggregate(last=Max('updated_at'))['last'] for model in models],
+        table_versions(models),
+    ))
+
+
+def _validators(request, models, refresh):
+    state = _change_state(models)
+    stamps = [last for last, _ in state if last is not None]
+    last_modified = max(stamps) if stamps else None
+
+    user = request.user
+    session_key = getattr(getattr(request, 'session', None), 'session_key', None)
+    parts = [
+        request.get_full_path(),
+        str(user.pk), getattr(user, 'role', ''),
+        session_key or '', request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+        timezone.localdate().isoformat(),
+        str(int(time.time() // refresh)) if refresh else '',
+    ] + [f'{last.isoformat() if last else "-"}:{version}' for last, version in state]
+    etag = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return f'"{etag}"', last_modified
+
+
+def conditional_page(*models, refresh=None):
+    """Serve 304s and cached HTML while none of ``models`` has changed.
+
+    The ETag covers the max ``updated_at`` and delete counter of every
+    model the page reads, plus the user/session and today's date. Pages
+    whose figures also move with the clock pass ``refresh`` (seconds) to
+    start a new ETag every ``refresh`` seconds. Requests with pending flash
+    messages bypass both layers so messages are never lost or replayed.
+    """
+    def decorator(view):
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or len(get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            etag, last_modified = _validators(request, models, refresh)
+            timestamp = last_modified.timestamp() if last_modified else None
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                key = PAGE_KEY.format(etag.strip('"'))
+                response = cache.get(key)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                    if response.status_code == 200 and not response.streaming:
+                        cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+
+            response.headers['ETag'] = etag
+            if timestamp is not None:
+                response.headers['Last-Modified'] = http_date(timestamp)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return inner
+    return decorator
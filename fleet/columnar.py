@@ -0,0 +1,202 @@
+"""
+Parquet / Arrow IPC exports of the raw fleet tables for the data warehouse.
+
+Each dataset is streamed from a chunked ``values_list()`` iterator in
+``(updated_at, id)`` order - the ``*_updated_idx`` indexes - and every
+chunk becomes one Arrow record batch (one Parquet row group). Column types
+come from the model fields, so decimals stay ``decimal128`` and timestamps
+stay UTC timestamps instead of text.
+
+Incremental exports pass ``since``: only rows with
+``since < updated_at <= watermark`` are written, where ``watermark`` is the
+newest ``updated_at`` older than ``CHANGE_FEED_SETTLE_SECONDS``. Rows younger
+than that may belong to transactions that have not committed yet, so they
+are left for the next run; feeding the returned watermark back as the next
+``since`` moves every changed row exactly once, as long as no transaction
+commits more than the settle lag after stamping its rows.
+
+pyarrow is optional; ``ColumnarUnavailable`` is raised when it is missing.
+"""
+import io
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Max
+from django.utils import timezone
+
+from .analytics import vehicle_analytics
+from .models import Trip, Expense, MaintenanceLog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+DATASETS = {
+    'trips': Trip,
+    'expenses': Expense,
+    'maintenance': MaintenanceLog,
+}
+DEFAULT_BATCH_SIZE = 50_000
+
+
+class ColumnarUnavailable(RuntimeError):
+    pass
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ColumnarUnavailable('pyarrow is required for Parquet/Arrow exports: pip install pyarrow')
+
+
+def _arrow_type(field):
+    if isinstance(field, models.ForeignKey):
+        return pa.int64()
+    if isinstance(field, models.DecimalField):
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, (models.AutoField, models.BigAutoField, models.IntegerField)):
+        return pa.int64()
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    return pa.string()
+
+
+def model_schema(model):
+    """(column names, Arrow schema) for every concrete field of ``model``"""
+    _require_pyarrow()
+    fields = model._meta.concrete_fields
+    columns = [field.attname for field in fields]
+    schema = pa.schema([pa.field(field.attname, _arrow_type(field), nullable=field.null) for field in fields])
+    return columns, schema
+
+
+def watermark(model, since=None):
+    """Upper ``updated_at`` bound for an export: the newest settled change, never below ``since``"""
+    settled = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+    latest = model.objects.filter(updated_at__lte=settled).aggregate(latest=Max('updated_at'))['latest']
+    if since is not None and (latest is None or latest < since):
+        return since
+    # Nothing has settled yet; the bound still has to hold back unsettled rows
+    return latest or settled
+
+
+def record_batches(model, since=None, until=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Arrow record batches of ``model`` rows with ``since < updated_at <= until``"""
+    columns, schema = model_schema(model)
+    queryset = model.objects.order_by('updated_at', 'id')
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+    if until is not None:
+        queryset = queryset.filter(updated_at__lte=until)
+
+    chunk = []
+    for row in queryset.values_list(*columns).iterator(chunk_size=batch_size):
+        chunk.append(row)
+        if len(chunk) == batch_size:
+            yield _to_batch(chunk, schema)
+            chunk = []
+    if chunk:
+        yield _to_batch(chunk, schema)
+
+
+def _to_batch(rows, schema):
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+        schema=schema,
+    )
+
+
+def analytics_table(start_date, end_date):
+    """One Arrow table of the per-vehicle analytics for the reports page range"""
+    _require_pyarrow()
+    rows, _ = vehicle_analytics(start_date, end_date)
+    return pa.table({
+        'vehicle_id': pa.array([row['vehicle'].pk for row in rows], pa.int64()),
+        'name': pa.array([row['vehicle'].name for row in rows], pa.string()),
+        'vehicle_type': pa.array([row['vehicle'].vehicle_type for row in rows], pa.string()),
+        'status': pa.array([row['vehicle'].status for row in rows], pa.string()),
+        'total_operational_cost': pa.array([row['total_operational_cost'] for row in rows], pa.decimal128(16, 2)),
+        'completed_trips': pa.array([row['completed_trips'] for row in rows], pa.int64()),
+        'odometer': pa.array([row['odometer'] for row in rows], pa.decimal128(12, 1)),
+        'utilization_pct': pa.array([row['utilization'] for row in rows], pa.float64()),
+        'range_start': pa.array([start_date] * len(rows), pa.date32()),
+        'range_end': pa.array([end_date] * len(rows), pa.date32()),
+    })
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _writer(fmt, sink, schema):
+    if fmt == 'parquet':
+        return pq.ParquetWriter(sink, schema, compression='zstd')
+    return pa.ipc.new_stream(sink, schema)
+
+
+def stream(fmt, schema, batches):
+    """Yield encoded bytes for ``batches`` as they are written"""
+    _require_pyarrow()
+    sink = _Sink()
+    writer = _writer(fmt, sink, schema)
+    for batch in batches:
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def write_dataset(fmt, path, model, since=None, until=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Write one dataset export to ``path``; returns the number of rows written"""
+    _, schema = model_schema(model)
+    rows = 0
+    with open(path, 'wb') as fh:
+        writer = _writer(fmt, fh, schema)
+        for batch in record_batches(model, since, until, batch_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+        writer.close()
+    return rows
+
+
+def parse_since(value):
+    """``?since=`` / ``--since`` as an aware datetime, or None"""
+    if not value:
+        return None
+    since = datetime.fromisoformat(value)
+    if since.tzinfo is None:
+        raise ValueError('since must include a UTC offset, e.g. 2026-01-31T00:00:00+00:00')
+    return since
@@ -0,0 +1,176 @@
+"""
+Driver license compliance - expiry warnings and bulk suspensions.
+
+Everything here works on whole querysets rather than individual rows so the
+batch job stays fast on very large driver tables: expiry checks are indexed
+range lookups on ``license_expiry``, suspensions are set-based ``UPDATE``s and
+notices go out over a single mail connection.
+
+A driver gets one expiry warning per license expiry date
+(``Driver.expiry_notice_for``), not one per run. Drivers on a dispatched
+trip are not suspended mid-trip; the first run after the trip ends
+suspends them.
+"""
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from . import events
+from .models import Driver, FleetEvent, Trip
+
+
+DEFAULT_WARNING_DAYS = 30
+DEFAULT_BATCH_SIZE = 500
+
+
+def _today():
+    return timezone.localdate()
+
+
+def expiring_drivers(days=DEFAULT_WARNING_DAYS, today=None):
+    """Drivers whose license is still valid but lapses within ``days`` days"""
+    today = today or _today()
+    return Driver.objects.filter(
+        license_expiry__gte=today,
+        license_expiry__lte=today + timedelta(days=days),
+    ).exclude(status=Driver.Status.SUSPENDED)
+
+
+def unnotified(drivers):
+    """``drivers`` not yet warned about their current license expiry date"""
+    return drivers.exclude(expiry_notice_for=F('license_expiry'))
+
+
+def expired_drivers(today=None):
+    """Drivers with a lapsed license that have not been suspended yet"""
+    today = today or _today()
+    return Driver.objects.filter(license_expiry__lt=today).exclude(status=Driver.Status.SUSPENDED)
+
+
+def _driving():
+    return Exists(Trip.objects.filter(driver=OuterRef('pk'), status=Trip.Status.DISPATCHED))
+
+
+def on_trip(drivers):
+    """``drivers`` currently driving a dispatched trip"""
+    return drivers.filter(_driving())
+
+
+def suspend_expired_drivers(today=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Suspend every driver with an expired license who is not on a dispatched trip.
+
+    Returns the primary keys of the suspended drivers. Each chunk of
+    ``batch_size`` drivers is locked, suspended and committed in its own
+    transaction, so row locks are held for one chunk at a time. The
+    ``UPDATE`` repeats the expiry and on-trip conditions, so a license renewed
+    or a trip dispatched since the run started is respected.
+    """
+    suspendable = expired_drivers(today).exclude(_driving())
+    suspended = []
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                suspendable.filter(pk__gt=last_pk).order_by('pk')
+                .select_for_update().values_list('pk', 'status')[:batch_size]
+            )
+            if not rows:
+                break
+            ids = [pk for pk, _ in rows]
+            now = timezone.now()
+            suspendable.filter(pk__in=ids).update(status=Driver.Status.SUSPENDED, updated_at=now)
+            events.record_all(
+                events.transition(FleetEvent.EntityType.DRIVER, pk, previous_status, Driver.Status.SUSPENDED, at=now)
+                for pk, previous_status in rows
+            )
+        suspended.extend(ids)
+        last_pk = ids[-1]
+    return suspended
+
+
+def _expiry_notice(driver, today):
+    days_left = (driver['license_expiry'] - today).days
+    if days_left < 0:
+        subject = 'FleetFlow: your driver license has expired'
+        body = (
+            f"Hello {driver['name']},\n\n"
+            f"Your license {driver['license_number']} expired on {driver['license_expiry']:%Y-%m-%d}. "
+            "You have been suspended from trip assignment until it is renewed.\n"
+        )
+    else:
+        subject = 'FleetFlow: your driver license expires soon'
+        body = (
+            f"Hello {driver['name']},\n\n"
+            f"Your license {driver['license_number']} expires on {driver['license_expiry']:%Y-%m-%d} "
+            f"({days_left} day{'s' if days_left != 1 else ''} left). Please renew it to stay eligible for trips.\n"
+        )
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [driver['email']])
+
+
+def send_expiry_notices(drivers, today=None, batch_size=DEFAULT_BATCH_SIZE, connection=None):
+    """Email every driver in ``drivers`` over one mail connection.
+
+    Messages are built from ``values()`` rows and handed to the backend in
+    batches of ``batch_size``. Pass an open ``connection`` to share it across
+    calls; otherwise one is opened and closed here. Each sent batch is
+    recorded in ``expiry_notice_for``. Returns the number of messages sent.
+    """
+    today = today or _today()
+    rows = drivers.order_by().values('pk', 'name', 'email', 'license_number', 'license_expiry')
+    if connection is None:
+        connection = get_connection(fail_silently=False)
+        managed = connection
+    else:
+        managed = nullcontext()
+    sent = 0
+    with managed:
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append((row['pk'], _expiry_notice(row, today)))
+            if len(batch) >= batch_size:
+                sent += _send(connection, batch)
+                batch = []
+        if batch:
+            sent += _send(connection, batch)
+    return sent
+
+
+def _send(connection, batch):
+    sent = connection.send_messages([message for _, message in batch]) or 0
+    # Bookkeeping only: updated_at is left alone so pages and feeds do not see a change
+    Driver.objects.filter(pk__in=[pk for pk, _ in batch]).update(expiry_notice_for=F('license_expiry'))
+    return sent
+
+
+def run_compliance_check(days=DEFAULT_WARNING_DAYS, today=None, batch_size=DEFAULT_BATCH_SIZE,
+                         notify=True, dry_run=False):
+    """Warn drivers close to expiry and suspend (and notify) expired ones"""
+    today = today or _today()
+    expiring = expiring_drivers(days, today)
+    summary = {
+        'expiring': expiring.count(),
+        'suspended': 0,
+        'deferred': on_trip(expired_drivers(today)).count(),
+        'emails_sent': 0,
+    }
+
+    if dry_run:
+        summary['suspended'] = expired_drivers(today).count() - summary['deferred']
+        return summary
+
+    suspended_ids = suspend_expired_drivers(today, batch_size)
+    summary['suspended'] = len(suspended_ids)
+
+    if notify:
+        with get_connection(fail_silently=False) as connection:
+            summary['emails_sent'] += send_expiry_notices(unnotified(expiring), today, batch_size, connection)
+            for start in range(0, len(suspended_ids), batch_size):
+                chunk = Driver.objects.filter(pk__in=suspended_ids[start:start + batch_size])
+                summary['emails_sent'] += send_expiry_notices(chunk, today, batch_size, connection)
+
+    return summary
@@ -0,0 +1,73 @@
+import json
+from functools import lru_cache
+
+from django.conf import settings
+
+
+@lru_cache(maxsize=64)
+def _navigation(url_name):
+    """Sidebar state for a URL name - computed once per route, not per request"""
+    in_fleet = any(part in url_name for part in ('vehicle', 'trip', 'maintenance'))
+    in_financial = 'expense' in url_name or 'reports' in url_name
+    is_trip_action = any(part in url_name for part in ('dispatch', 'complete', 'cancel'))
+
+    if url_name == 'dashboard':
+        active = 'dashboard'
+    elif 'vehicle' in url_name:
+        active = 'vehicles'
+    elif 'trip' in url_name and not is_trip_action:
+        active = 'trips'
+    elif 'maintenance' in url_name:
+        active = 'maintenance'
+    elif 'expense' in url_name:
+        active = 'expenses'
+    elif 'reports' in url_name:
+        active = 'reports'
+    elif 'driver' in url_name:
+        active = 'drivers'
+    else:
+        active = ''
+
+    if in_fleet:
+        section = 'fleet'
+    elif in_financial:
+        section = 'financial'
+    elif 'driver' in url_name:
+        section = 'personnel'
+    else:
+        section = ''
+
+    return {'section': section, 'active': active}
+
+
+def navigation(request):
+    """Expose the sidebar's open section and active link as ``nav``"""
+    match = getattr(request, 'resolver_match', None)
+    return {'nav': _navigation((match.url_name or '') if match else '')}
+
+
+LOGO = 'fleetflow-logo'
+
+
+@lru_cache(maxsize=1)
+def _logo():
+    """Logo variant names and the 1x size, from the manifest ``optimize_images`` writes"""
+    manifest = settings.BASE_DIR / 'static' / 'images' / 'variants.json'
+    try:
+        sizes = json.loads(manifest.read_text()).get(LOGO)
+    except FileNotFoundError:
+        sizes = None
+    if not sizes:
+        return None
+    (width, height), (large, _) = sizes[0], sizes[-1]
+    return {
+        'small': f'images/{LOGO}-{width}',
+        'large': f'images/{LOGO}-{large}',
+        'width': width,
+        'height': height,
+    }
+
+
+def logo(request):
+    """Expose the logo's generated variants as ``logo`` (None until they are generated)"""
+    return {'logo': _logo()}
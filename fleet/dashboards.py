@@ -0,0 +1,156 @@
+"""
+Per-role dashboards.
+
+Each role gets its own card builder that only touches the tables it shows:
+a dispatcher's dashboard never reads expenses, an analyst's never reads
+drivers. Counts are taken with one grouped or conditional aggregate per
+table instead of one ``COUNT`` per card.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .aggregates import DecimalSum
+from .compliance import DEFAULT_WARNING_DAYS
+from .models import User, Vehicle, Driver, Trip, Expense, MaintenanceLog, VehicleArchiveRollup
+
+
+def _card(label, value, hint):
+    return {'label': label, 'value': value, 'hint': hint}
+
+
+def _vehicle_status_counts():
+    counts = dict(Vehicle.objects.order_by().values_list('status').annotate(n=Count('id')))
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def _trip_status_counts():
+    """Hot trips by status, plus the archived ones (archiving only moves completed and cancelled trips)"""
+    counts = dict(Trip.objects.order_by().values_list('status').annotate(n=Count('id')))
+    archived = VehicleArchiveRollup.objects.aggregate(
+        total=Coalesce(Sum('archived_trips'), 0),
+        completed=Coalesce(Sum('completed_trips'), 0),
+    )
+    counts[Trip.Status.COMPLETED] = counts.get(Trip.Status.COMPLETED, 0) + archived['completed']
+    counts[Trip.Status.CANCELLED] = counts.get(Trip.Status.CANCELLED, 0) + archived['total'] - archived['completed']
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def _utilization(vehicle_counts):
+    assigned = vehicle_counts.get(Vehicle.Status.ON_TRIP, 0) + vehicle_counts.get(Vehicle.Status.IN_SHOP, 0)
+    total = vehicle_counts['total']
+    return round(assigned / total * 100, 2) if total > 0 else 0
+
+
+def fleet_manager_dashboard():
+    vehicles = _vehicle_status_counts()
+    trips = _trip_status_counts()
+    return {
+        'kpi_cards': [
+            _card('Active Fleet', vehicles.get(Vehicle.Status.ON_TRIP, 0), 'Vehicles on trip'),
+            _card('Maintenance Alerts', vehicles.get(Vehicle.Status.IN_SHOP, 0), 'Vehicles in shop'),
+            _card('Utilization Rate', f'{_utilization(vehicles)}%', 'Assigned vs idle'),
+            _card('Pending Cargo', trips.get(Trip.Status.DRAFT, 0), 'Shipments waiting'),
+        ],
+        'summary_cards': [
+            _card('Total Vehicles', vehicles['total'], ''),
+            _card('Total Drivers', Driver.objects.count(), ''),
+            _card('Total Trips', trips['total'], ''),
+        ],
+    }
+
+
+def dispatcher_dashboard():
+    vehicles = _vehicle_status_counts()
+    trips = _trip_status_counts()
+    on_duty = Driver.objects.filter(status=Driver.Status.ON_DUTY).count()
+    return {
+        'kpi_cards': [
+            _card('Available Vehicles', vehicles.get(Vehicle.Status.AVAILABLE, 0), 'Ready to dispatch'),
+            _card('Active Fleet', vehicles.get(Vehicle.Status.ON_TRIP, 0), 'Vehicles on trip'),
+            _card('Pending Cargo', trips.get(Trip.Status.DRAFT, 0), 'Shipments waiting'),
+            _card('Drivers On Duty', on_duty, 'Available for assignment'),
+        ],
+        'summary_cards': [
+            _card('Dispatched Trips', trips.get(Trip.Status.DISPATCHED, 0), ''),
+            _card('Completed Trips', trips.get(Trip.Status.COMPLETED, 0), ''),
+            _card('Total Trips', trips['total'], ''),
+        ],
+    }
+
+
+def safety_officer_dashboard():
+    today = timezone.localdate()
+    drivers = Driver.objects.aggregate(
+        total=Count('id'),
+        suspended=Count('id', filter=Q(status=Driver.Status.SUSPENDED)),
+        expired=Count('id', filter=Q(license_expiry__lt=today)),
+        expiring=Count('id', filter=Q(
+            license_expiry__gte=today,
+            license_expiry__lte=today + timedelta(days=DEFAULT_WARNING_DAYS),
+        ) & ~Q(status=Driver.Status.SUSPENDED)),
+    )
+    in_shop = Vehicle.objects.filter(status=Vehicle.Status.IN_SHOP).count()
+    open_logs = MaintenanceLog.objects.filter(completed_at__isnull=True).count()
+    return {
+        'kpi_cards': [
+            _card('Maintenance Alerts', in_shop, 'Vehicles in shop'),
+            _card('Licenses Expiring', drivers['expiring'], f'Within {DEFAULT_WARNING_DAYS} days'),
+            _card('Expired Licenses', drivers['expired'], 'Blocked from trips'),
+            _card('Suspended Drivers', drivers['suspended'], 'Not assignable'),
+        ],
+        'summary_cards': [
+            _card('Total Drivers', drivers['total'], ''),
+            _card('Open Maintenance Logs', open_logs, ''),
+        ],
+    }
+
+
+def financial_analyst_dashboard():
+    month_start = timezone.localdate().replace(day=1)
+    # An aware lower bound keeps the filter on the indexed date column itself
+    month_start_at = timezone.make_aware(datetime.combine(month_start, time.min))
+    operational = [Expense.Type.FUEL, Expense.Type.MAINTENANCE, Expense.Type.REPAIR]
+    expenses = Expense.objects.aggregate(
+        operational=DecimalSum('amount', filter=Q(expense_type__in=operational)),
+        fuel=DecimalSum('amount', filter=Q(expense_type=Expense.Type.FUEL)),
+        this_month=DecimalSum('amount', filter=Q(date__gte=month_start_at)),
+    )
+    # Archived expenses only survive as per-vehicle rollups
+    archived = VehicleArchiveRollup.objects.aggregate(
+        operational=DecimalSum('operational_cost'),
+        fuel=DecimalSum('fuel_cost'),
+    )
+    operational_total = (expenses['operational'] or 0) + (archived['operational'] or 0)
+    fuel_total = (expenses['fuel'] or 0) + (archived['fuel'] or 0)
+    maintenance = MaintenanceLog.objects.aggregate(total=DecimalSum('cost'))['total'] or 0
+    vehicles = _vehicle_status_counts()
+    return {
+        'kpi_cards': [
+            _card('Operational Cost', f'${operational_total:,.2f}', 'Fuel + maintenance + repair'),
+            _card('Fuel Spend', f'${fuel_total:,.2f}', 'All fuel expenses'),
+            _card('This Month', f"${expenses['this_month'] or 0:,.2f}", f'Since {month_start:%b %d}'),
+            _card('Maintenance Logs Cost', f'${maintenance:,.2f}', 'Logged service cost'),
+        ],
+        'summary_cards': [
+            _card('Utilization Rate', f'{_utilization(vehicles)}%', ''),
+            _card('Total Vehicles', vehicles['total'], ''),
+        ],
+    }
+
+
+DASHBOARD_BUILDERS = {
+    User.Role.FLEET_MANAGER: fleet_manager_dashboard,
+    User.Role.DISPATCHER: dispatcher_dashboard,
+    User.Role.SAFETY_OFFICER: safety_officer_dashboard,
+    User.Role.FINANCIAL_ANALYST: financial_analyst_dashboard,
+}
+
+
+def dashboard_for(user):
+    """Cards for ``user``'s role; unknown roles get the fleet manager view"""
+    return DASHBOARD_BUILDERS.get(user.role, fleet_manager_dashboard)()
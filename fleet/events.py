@@ -0,0 +1,150 @@
+"""
+Append-only fleet event log.
+
+Views build a :func:`transition` for every status change they make and write
+them with :func:`record_all`: one ``bulk_create`` inside the caller's
+transaction, so a dispatch touching a trip, a vehicle and a driver costs one
+``INSERT``, and events written in a transaction or savepoint that rolls back
+are discarded along with it. :func:`record` and the ``record_*`` helpers
+write a single transition.
+
+Point-in-time counts start from the latest :class:`StatusSnapshot` (taken
+periodically by ``snapshot_fleet_status``) and replay only the events after
+it, so their cost follows the time since the last snapshot rather than the
+whole log. Snapshots are only taken ``CHANGE_FEED_SETTLE_SECONDS`` short of
+now; an event recorded with an earlier time (a late device sync) drops the
+snapshots it predates, and the next run retakes them.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import FleetEvent, StatusSnapshot
+
+
+def transition(entity_type, entity_id, from_status, to_status, actor=None, at=None):
+    """Unsaved event for a status change, or None when the status did not change"""
+    if from_status == to_status:
+        return None
+    event = FleetEvent(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        from_status=from_status or '',
+        to_status=to_status,
+        actor=actor if getattr(actor, 'is_authenticated', False) else None,
+    )
+    if at is not None:
+        event.occurred_at = at
+    return event
+
+
+def vehicle_transition(vehicle, from_status, actor=None, at=None):
+    return transition(FleetEvent.EntityType.VEHICLE, vehicle.pk, from_status, vehicle.status, actor, at)
+
+
+def driver_transition(driver, from_status, actor=None, at=None):
+    return transition(FleetEvent.EntityType.DRIVER, driver.pk, from_status, driver.status, actor, at)
+
+
+def trip_transition(trip, from_status, actor=None, at=None):
+    return transition(FleetEvent.EntityType.TRIP, trip.pk, from_status, trip.status, actor, at)
+
+
+def record_all(transitions):
+    """Write ``transitions`` (None entries are skipped) with one ``INSERT``"""
+    rows = [event for event in transitions if event is not None]
+    if not rows:
+        return
+    FleetEvent.objects.bulk_create(rows, batch_size=1000)
+
+    settled = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+    earliest = {}
+    for event in rows:
+        if event.occurred_at < settled:
+            earliest[event.entity_type] = min(event.occurred_at, earliest.get(event.entity_type, event.occurred_at))
+    for entity_type, at in earliest.items():
+        StatusSnapshot.objects.filter(entity_type=entity_type, taken_at__gte=at).delete()
+
+
+def record(entity_type, entity_id, from_status, to_status, actor=None, at=None):
+    """Write one status transition; no-op when the status did not change"""
+    record_all([transition(entity_type, entity_id, from_status, to_status, actor, at)])
+
+
+def record_vehicle(vehicle, from_status, actor=None, at=None):
+    record_all([vehicle_transition(vehicle, from_status, actor, at)])
+
+
+def record_driver(driver, from_status, actor=None, at=None):
+    record_all([driver_transition(driver, from_status, actor, at)])
+
+
+def record_trip(trip, from_status, actor=None, at=None):
+    record_all([trip_transition(trip, from_status, actor, at)])
+
+
+def _since_snapshot(entity_type, at):
+    """``(taken_at, latest)``: the latest snapshot at or before ``at`` and each entity's last event after it.
+
+    "Last" is by ``(occurred_at, id)``: synced device events carry the time
+    they happened, so a higher id is not necessarily newer. Without a
+    snapshot, ``taken_at`` is None and ``latest`` covers the whole log.
+    """
+    taken_at = StatusSnapshot.objects.filter(entity_type=entity_type, taken_at__lte=at).aggregate(
+        latest=Max('taken_at')
+    )['latest']
+    events = FleetEvent.objects.order_by().filter(entity_type=entity_type, occurred_at__lte=at)
+    if taken_at is not None:
+        events = events.filter(occurred_at__gt=taken_at)
+    # One probe of event_entity_time_idx per event in the window
+    last = events.filter(entity_id=OuterRef('entity_id')).order_by('-occurred_at', '-id').values('id')[:1]
+    return taken_at, events.filter(id=Subquery(last))
+
+
+def _carried(entity_type, taken_at, latest):
+    """Snapshot rows of the entities with no event since the snapshot"""
+    return StatusSnapshot.objects.order_by().filter(entity_type=entity_type, taken_at=taken_at).exclude(
+        entity_id__in=latest.values('entity_id')
+    )
+
+
+def status_counts_at(entity_type, at):
+    """{status: count} of entities of ``entity_type`` as they stood at ``at``.
+
+    Entities with no recorded history before ``at`` are not counted.
+    """
+    taken_at, latest = _since_snapshot(entity_type, at)
+    counts = Counter(dict(latest.values_list('to_status').annotate(n=Count('id'))))
+    if taken_at is not None:
+        counts.update(dict(_carried(entity_type, taken_at, latest).values_list('status').annotate(n=Count('id'))))
+    return dict(counts)
+
+
+def count_in_status_at(entity_type, status, at):
+    """e.g. ``count_in_status_at('VEHICLE', 'ON_TRIP', t)``"""
+    return status_counts_at(entity_type, at).get(status, 0)
+
+
+def take_snapshot(entity_type, at=None):
+    """Store the status of every ``entity_type`` entity at ``at`` (default: settled now); returns the row count"""
+    if at is None:
+        at = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+    with transaction.atomic():
+        if StatusSnapshot.objects.filter(entity_type=entity_type, taken_at=at).exists():
+            return 0
+        taken_at, latest = _since_snapshot(entity_type, at)
+        statuses = dict(latest.values_list('entity_id', 'to_status'))
+        if taken_at is not None:
+            statuses.update(_carried(entity_type, taken_at, latest).values_list('entity_id', 'status'))
+        StatusSnapshot.objects.bulk_create(
+            [
+                StatusSnapshot(entity_type=entity_type, entity_id=entity_id, status=status, taken_at=at)
+                for entity_id, status in statuses.items()
+            ],
+            batch_size=1000,
+        )
+    return len(statuses)
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from fleet import archive
+
+
+class Command(BaseCommand):
+    help = 'Move finished trips and their expenses (and old standalone expenses) into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=365,
+                            help='Archive trips that ended / expenses dated more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=archive.DEFAULT_BATCH_SIZE,
+                            help='Trips or expenses per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+
+        if options['dry_run']:
+            self.stdout.write(f'Cutoff: {cutoff:%Y-%m-%d %H:%M}')
+            self.stdout.write(f'[dry run] Trips to archive: {archive.archivable_trips(cutoff).count()}')
+            self.stdout.write(f'[dry run] Standalone expenses to archive: {archive.archivable_expenses(cutoff).count()}')
+            return
+
+        def progress(trips, expenses):
+            self.stdout.write(f'  archived {trips} trips, {expenses} expenses')
+
+        trips, expenses = archive.archive_before(cutoff, options['batch_size'], progress)
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {trips} trips and {expenses} expenses older than {cutoff:%Y-%m-%d}'
+        ))
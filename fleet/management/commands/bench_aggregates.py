@@ -0,0 +1,65 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from fleet.aggregates import DecimalSum
+from fleet.models import Vehicle, Expense
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Sum vs DecimalSum over synthetic expenses and check totals to the cent (changes are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--expenses', type=int, default=500_000)
+        parser.add_argument('--vehicles', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        n = options['expenses']
+
+        with transaction.atomic():
+            vehicles = Vehicle.objects.bulk_create([
+                Vehicle(name=f'Bench {i}', model_name='Bench', license_plate=f'BENCH-AGG-{i}',
+                        vehicle_type=Vehicle.Type.VAN, max_load_capacity=1000)
+                for i in range(options['vehicles'])
+            ])
+            vehicle_ids = [v.pk for v in vehicles]
+            now = timezone.now()
+            expected = {}
+            batch = []
+            for _ in range(n):
+                vehicle_id = rng.choice(vehicle_ids)
+                amount = Decimal(rng.randrange(1, 50_000_00)).scaleb(-2)
+                expected[vehicle_id] = expected.get(vehicle_id, 0) + amount
+                batch.append(Expense(vehicle_id=vehicle_id, expense_type=Expense.Type.FUEL, amount=amount, date=now))
+                if len(batch) == 10_000:
+                    Expense.objects.bulk_create(batch)
+                    batch = []
+            Expense.objects.bulk_create(batch)
+            expected_total = sum(expected.values())
+            self.stdout.write(f'{n:,} expenses over {len(vehicle_ids):,} vehicles, exact total {expected_total:,}')
+
+            for label, aggregate in (('Sum', Sum), ('DecimalSum', DecimalSum)):
+                best = None
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    totals = dict(
+                        Expense.objects.order_by().filter(vehicle_id__in=vehicle_ids)
+                        .values_list('vehicle_id').annotate(total=aggregate('amount'))
+                    )
+                    elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                wrong = sum(1 for pk, total in expected.items() if totals.get(pk) != total)
+                fleet_total = sum(totals.values())
+                self.stdout.write(
+                    f'{label:10} {best:6.3f} s ({n / best:,.0f} rows/s)  total {fleet_total}  '
+                    f'vehicles off by any amount: {wrong}'
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from fleet import anomalies
+
+
+class Command(BaseCommand):
+    help = 'Benchmark vectorized anomaly scoring on synthetic fuel expenses (no DB access)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--expenses', type=int, default=2_000_000)
+        parser.add_argument('--vehicles', type=int, default=5000)
+        parser.add_argument('--outliers', type=float, default=0.001, help='Share of rows with a padded amount')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        n = options['expenses']
+        vehicles = np.sort(rng.integers(0, options['vehicles'], n))
+        liters = rng.uniform(20, 80, n)
+        price = rng.normal(1.6, 0.05, n)
+        padded = rng.random(n) < options['outliers']
+        price[padded] *= 2
+        distance = liters / rng.normal(0.12, 0.01, n)
+        columns = {
+            'id': np.arange(n),
+            'vehicle': vehicles,
+            'amount': np.round(price * liters, 2),
+            'liters': liters,
+            'distance': distance,
+        }
+
+        started = time.perf_counter()
+        total, reasons = anomalies.score(columns)
+        elapsed = time.perf_counter() - started
+
+        flagged = np.zeros(n, dtype=bool)
+        flagged[[i for i, _ in reasons]] = True
+        caught = np.count_nonzero(flagged & padded)
+        self.stdout.write(
+            f'Scored {n:,} expenses over {options["vehicles"]:,} vehicles in {elapsed:.2f} s '
+            f'({n / elapsed:,.0f} rows/s); flagged {flagged.sum():,}, '
+            f'caught {caught:,} of {padded.sum():,} padded receipts'
+        )
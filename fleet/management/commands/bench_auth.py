@@ -0,0 +1,73 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import login
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from fleet.auth import user_cache_is_shared
+from fleet.models import User
+
+
+PROFILES = [
+    ('db sessions + ModelBackend', 'django.contrib.sessions.backends.db',
+     'django.contrib.auth.backends.ModelBackend'),
+    ('cached_db sessions + CachedModelBackend', 'django.contrib.sessions.backends.cached_db',
+     'fleet.auth.CachedModelBackend'),
+    ('signed_cookies + CachedModelBackend', 'django.contrib.sessions.backends.signed_cookies',
+     'fleet.auth.CachedModelBackend'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-request session + user loading overhead for each auth profile (changes are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        n = options['requests']
+        self.stdout.write(f'{n} authenticated requests per profile')
+        if not user_cache_is_shared():
+            self.stdout.write('Default cache is process-local: CachedModelBackend loads users from the DB (set CACHE_URL)')
+
+        with transaction.atomic():
+            user = User.objects.create_user(username='bench-auth@fleetflow.com', password=None)
+            for label, engine, backend in PROFILES:
+                with override_settings(SESSION_ENGINE=engine, AUTHENTICATION_BACKENDS=[backend]):
+                    cache.clear()
+                    cookie = self._login(factory, user, backend)
+                    session_mw = SessionMiddleware(lambda r: HttpResponse())
+                    auth_mw = AuthenticationMiddleware(lambda r: HttpResponse())
+
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        for _ in range(n):
+                            request = factory.get('/dashboard/')
+                            request.COOKIES[settings.SESSION_COOKIE_NAME] = cookie
+                            session_mw.process_request(request)
+                            auth_mw.process_request(request)
+                            assert request.user.is_authenticated
+                        elapsed = time.perf_counter() - start
+
+                    self.stdout.write(
+                        f'{label:42} {elapsed / n * 1e6:8.1f} us/request   '
+                        f'{len(queries) / n:4.2f} queries/request'
+                    )
+            transaction.set_rollback(True)
+        cache.clear()
+
+    def _login(self, factory, user, backend):
+        request = factory.get('/login/')
+        SessionMiddleware(lambda r: HttpResponse()).process_request(request)
+        request.user = None
+        login(request, user, backend=backend)
+        request.session.save()
+        return request.session.session_key
@@ -0,0 +1,62 @@
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# Optional dependencies that only some views and jobs need
+HEAVY_MODULES = ('reportlab', 'pypdf', 'numpy', 'pyarrow')
+
+
+def parse_importtime(stderr):
+    """({module: cumulative microseconds}, total microseconds) from ``python -X importtime`` output"""
+    cumulative, total = {}, 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, us, name = line[len('import time:'):].split('|')
+        cumulative[name.strip()] = int(us)
+        # Nested imports are indented and already counted in their parent
+        if not name[1:].startswith(' '):
+            total += int(us)
+    return cumulative, total
+
+
+class Command(BaseCommand):
+    help = 'Measure cold-start import time of a manage.py command (python -X importtime)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('args', nargs='*', default=['check'], help='manage.py command to start (default: check)')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--top', type=int, default=15)
+
+    def handle(self, *args, **options):
+        argv = [sys.executable, '-X', 'importtime', str(settings.BASE_DIR / 'manage.py'), *args]
+        walls, imports, cumulative = [], [], {}
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            result = subprocess.run(argv, capture_output=True, text=True, cwd=settings.BASE_DIR)
+            walls.append(time.perf_counter() - started)
+            if result.returncode:
+                self.stderr.write(result.stdout + result.stderr)
+                return
+            cumulative, total = parse_importtime(result.stderr)
+            imports.append(total)
+
+        self.stdout.write(f'manage.py {" ".join(args)}: {len(cumulative)} modules imported')
+        self.stdout.write(f'  wall      median {statistics.median(walls) * 1000:7.1f} ms  min {min(walls) * 1000:7.1f} ms')
+        self.stdout.write(f'  imports   median {statistics.median(imports) / 1000:7.1f} ms  min {min(imports) / 1000:7.1f} ms')
+        for package in HEAVY_MODULES:
+            loaded = sum(1 for name in cumulative if name.split('.')[0] == package)
+            self.stdout.write(f'  {package:9} {f"{loaded} modules" if loaded else "not imported"}')
+
+        self.stdout.write('Slowest fleet modules (cumulative, last run):')
+        fleet_modules = sorted(
+            ((us, name) for name, us in cumulative.items() if name.split('.')[0] in ('fleet', 'fleetflow')),
+            reverse=True,
+        )
+        for us, name in fleet_modules[:options['top']]:
+            self.stdout.write(f'  {us / 1000:7.1f} ms  {name}')
@@ -0,0 +1,47 @@
+import os
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from fleet import report_builder
+
+
+TYPES = ['Truck', 'Van', 'Bike', 'EV']
+STATUSES = ['Available', 'On Trip', 'In Shop']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark PDF export rendering on synthetic vehicle rows for increasing worker counts (no DB access)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vehicles', type=int, default=20_000)
+        parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--section-rows', type=int, default=report_builder.DEFAULT_SECTION_ROWS)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        rows = [
+            (
+                f'Vehicle {i:06d}', rng.choice(TYPES), rng.choice(STATUSES),
+                f'${rng.uniform(0, 50_000):.2f}', str(rng.randrange(500)),
+                f'{rng.uniform(0, 400_000):.0f} km', f'{rng.uniform(0, 100):.1f}%',
+            )
+            for i in range(options['vehicles'])
+        ]
+        sections = len(report_builder.plan_sections(rows, options['section_rows']))
+        self.stdout.write(f"{len(rows):,} vehicles in {sections} sections")
+
+        baseline = None
+        workers = 1
+        while workers <= options['max_workers']:
+            started = time.perf_counter()
+            pdf = report_builder.build_pdf('Benchmark', 'Synthetic fleet', rows, workers=workers,
+                                           section_rows=options['section_rows'])
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            self.stdout.write(
+                f'{workers:3} workers  {elapsed:7.2f} s  speedup {baseline / elapsed:4.1f}x  {len(pdf) / 1e6:.1f} MB'
+            )
+            workers *= 2
@@ -0,0 +1,86 @@
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from fleet import search
+from fleet.models import SearchEntry
+
+
+FIRST_NAMES = ['Alex', 'Maria', 'Sam', 'Priya', 'Jordan', 'Chen', 'Fatima', 'Lucas', 'Noah', 'Amara']
+LAST_NAMES = ['Garcia', 'Okafor', 'Novak', 'Schmidt', 'Tanaka', 'Silva', 'Haddad', 'Kowalski', 'Reyes', 'Berg']
+MODELS = ['Sprinter', 'Transit', 'Actros', 'Daily', 'Master', 'Crafter', 'FH16', 'Ducato']
+CITIES = ['Berlin', 'Hamburg', 'Munich', 'Cologne', 'Frankfurt', 'Leipzig', 'Dresden', 'Stuttgart',
+          'Bremen', 'Hanover', 'Nuremberg', 'Dortmund', 'Essen', 'Duisburg', 'Bochum', 'Wuppertal']
+# Far above real primary keys so the synthetic entries never collide with indexed objects
+OFFSET = 10 ** 12
+
+
+class Command(BaseCommand):
+    help = 'Benchmark global search on a synthetic search index (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        n = options['rows']
+        with transaction.atomic():
+            started = time.perf_counter()
+            plates = self._seed(rng, n)
+            self.stdout.write(f'Indexed {n:,} entries in {time.perf_counter() - started:.1f} s')
+
+            plate = rng.choice(plates)
+            for label, query in [
+                ('exact plate', plate),
+                ('plate fragment', plate[3:8]),
+                ('driver email', 'okafor21'),
+                ('license number', 'DL-0004'),
+                ('name + model', 'Maria Sprinter'),
+                ('route', 'Leipzig Bremen'),
+                ('common word', 'Berlin'),
+                ('no match', 'zzqxj'),
+            ]:
+                timings = []
+                for _ in range(options['repeat']):
+                    tick = time.perf_counter()
+                    found = search.matching_entries(search.terms(query))
+                    timings.append(time.perf_counter() - tick)
+                self.stdout.write(
+                    f'{label:16} {query!r:24} {len(found):3d} hits  '
+                    f'median {statistics.median(timings) * 1000:6.2f} ms  max {max(timings) * 1000:6.2f} ms'
+                )
+            transaction.set_rollback(True)
+
+    def _seed(self, rng, n):
+        plates = []
+
+        def entries():
+            for i in range(n):
+                roll = i % 10
+                if roll == 0:
+                    plate = ''.join(rng.choices(string.ascii_uppercase, k=3)) + f'-{rng.randrange(10000):04d}'
+                    plates.append(plate)
+                    yield SearchEntry(kind=SearchEntry.Kind.VEHICLE, object_id=OFFSET + i,
+                                      document=f'{plate} {rng.choice(FIRST_NAMES)} {rng.choice(MODELS)}')
+                elif roll == 1:
+                    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                    yield SearchEntry(kind=SearchEntry.Kind.DRIVER, object_id=OFFSET + i,
+                                      document=f'{first} {last} {first.lower()}.{last.lower()}{i % 100}@fleetflow.com DL-{i:07d}')
+                else:
+                    yield SearchEntry(kind=SearchEntry.Kind.TRIP, object_id=OFFSET + i,
+                                      document=f'{rng.choice(CITIES)} {rng.choice(CITIES)}')
+
+        batch = []
+        for entry in entries():
+            batch.append(entry)
+            if len(batch) == 10_000:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+        return plates
@@ -0,0 +1,75 @@
+import time
+from datetime import date, timedelta
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone
+
+from fleet.models import User, Vehicle, Driver, Trip, Expense
+
+
+class Command(BaseCommand):
+    help = 'Benchmark list/report page rendering with cold and warm row fragment caches (no DB writes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3, help='Warm renders to average')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        now = timezone.now()
+        vehicles = [
+            Vehicle(pk=i, name=f'Vehicle {i}', model_name='Model', license_plate=f'PL-{i:06d}',
+                    vehicle_type=Vehicle.Type.VAN, max_load_capacity=1000, odometer=i * 10.0,
+                    status=Vehicle.Status.AVAILABLE, updated_at=now)
+            for i in range(1, rows + 1)
+        ]
+        driver = Driver(pk=1, name='Driver', email='driver@fleetflow.com', license_number='L-1',
+                        license_expiry=date.today() + timedelta(days=365), updated_at=now)
+        trips = [
+            Trip(pk=v.pk, vehicle=v, driver=driver, cargo_weight=100, origin='Depot', destination='Site',
+                 status=Trip.Status.DRAFT, updated_at=now)
+            for v in vehicles
+        ]
+        expenses = [
+            Expense(pk=v.pk, vehicle=v, expense_type=Expense.Type.FUEL, amount=50, liters=20,
+                    date=now, updated_at=now)
+            for v in vehicles
+        ]
+        analytics = [
+            {'vehicle': v, 'total_operational_cost': 50, 'completed_trips': 1, 'odometer': v.odometer, 'utilization': 40.0}
+            for v in vehicles
+        ]
+
+        pages = [
+            ('/trips/', 'fleet/trip_list.html', {'trips': trips}),
+            ('/vehicles/', 'fleet/vehicle_list.html', {'vehicles': vehicles}),
+            ('/expenses/', 'fleet/expense_list.html', {'expenses': expenses, 'vehicle_costs_list': []}),
+            ('/reports/', 'fleet/reports.html', {'analytics': analytics}),
+        ]
+
+        factory = RequestFactory()
+        user = User(username='bench', role=User.Role.FLEET_MANAGER)
+        self.stdout.write(f'Rendering {rows} rows per page')
+        for path, template_name, context in pages:
+            request = factory.get(path)
+            request.user = user
+            request.resolver_match = resolve(path)
+
+            caches['template_fragments'].clear()
+            start = time.perf_counter()
+            render_to_string(template_name, context, request=request)
+            cold = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                render_to_string(template_name, context, request=request)
+            warm = (time.perf_counter() - start) / options['repeat']
+
+            self.stdout.write(
+                f'{template_name:28} cold {cold * 1000:9.1f} ms   warm {warm * 1000:9.1f} ms   '
+                f'speedup {cold / warm:5.2f}x'
+            )
@@ -0,0 +1,35 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from fleet.utilization import busy_seconds
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the utilization interval merge on synthetic trip/maintenance intervals (no DB access)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--intervals', type=int, default=1_000_000)
+        parser.add_argument('--vehicles', type=int, default=5000)
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        window = options['days'] * 86400.0
+        vehicles = options['vehicles']
+        intervals = []
+        for _ in range(options['intervals']):
+            start = rng.uniform(-86400.0, window)
+            intervals.append((rng.randrange(vehicles), start, start + rng.uniform(600.0, 3 * 86400.0)))
+
+        started = time.perf_counter()
+        busy = busy_seconds(intervals, 0.0, window)
+        elapsed = time.perf_counter() - started
+
+        fleet = sum(busy.values()) / (vehicles * window) * 100
+        self.stdout.write(
+            f"Merged {options['intervals']:,} intervals over {vehicles:,} vehicles in {elapsed:.2f} s "
+            f"({options['intervals'] / elapsed:,.0f} intervals/s); fleet utilization {fleet:.1f}%"
+        )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from fleet import compliance
+
+
+class Command(BaseCommand):
+    help = 'Warn drivers whose license expires soon and suspend drivers with expired licenses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=compliance.DEFAULT_WARNING_DAYS,
+                            help='Warn drivers whose license expires within this many days')
+        parser.add_argument('--batch-size', type=int, default=compliance.DEFAULT_BATCH_SIZE,
+                            help='Rows per UPDATE statement and emails per send batch')
+        parser.add_argument('--no-email', action='store_true', help='Suspend drivers without sending notices')
+        parser.add_argument('--dry-run', action='store_true', help='Only report counts, change nothing')
+
+    def handle(self, *args, **options):
+        summary = compliance.run_compliance_check(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            notify=not options['no_email'],
+            dry_run=options['dry_run'],
+        )
+
+        prefix = '[dry run] ' if options['dry_run'] else ''
+        self.stdout.write(f"{prefix}Licenses expiring within {options['days']} days: {summary['expiring']}")
+        self.stdout.write(f"{prefix}Drivers suspended for expired license: {summary['suspended']}")
+        self.stdout.write(f"{prefix}Expired but on a dispatched trip (suspended after it ends): {summary['deferred']}")
+        self.stdout.write(self.style.SUCCESS(f"{prefix}Notices sent: {summary['emails_sent']}"))
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from fleet import anomalies
+
+
+class Command(BaseCommand):
+    help = 'Score fuel expenses changed since the last run against their vehicle baselines and flag outliers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rescore every fuel expense, not just changed ones')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        scan = anomalies.detect(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Scored {scan.scored} fuel expenses, flagged {scan.flagged} '
+            f'({time.perf_counter() - started:.2f} s)'
+        ))
@@ -0,0 +1,57 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from fleet import columnar
+from fleet.analytics import report_range
+
+
+class Command(BaseCommand):
+    help = 'Export trips, expenses, maintenance logs and vehicle analytics as Parquet or Arrow IPC files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir')
+        parser.add_argument('--format', choices=sorted(columnar.FORMATS), default='parquet')
+        parser.add_argument('--datasets', nargs='+', choices=[*columnar.DATASETS, 'vehicle_analytics'],
+                            default=[*columnar.DATASETS, 'vehicle_analytics'])
+        parser.add_argument('--since', default='', help='Only rows updated after this ISO timestamp (with offset)')
+        parser.add_argument('--state-file',
+                            help='JSON file holding the last exported updated_at per dataset; read and advanced on success')
+        parser.add_argument('--batch-size', type=int, default=columnar.DEFAULT_BATCH_SIZE,
+                            help='Rows per Arrow batch / Parquet row group')
+
+    def handle(self, *args, **options):
+        fmt = options['format']
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        state_file = Path(options['state_file']) if options['state_file'] else None
+        state = json.loads(state_file.read_text()) if state_file and state_file.exists() else {}
+        stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+        _, extension = columnar.FORMATS[fmt]
+
+        try:
+            for dataset in options['datasets']:
+                path = output_dir / f'{dataset}-{stamp}.{extension}'
+                started = time.perf_counter()
+                if dataset == 'vehicle_analytics':
+                    table = columnar.analytics_table(*report_range({}))
+                    with open(path, 'wb') as fh:
+                        for chunk in columnar.stream(fmt, table.schema, table.to_batches()):
+                            fh.write(chunk)
+                    rows = table.num_rows
+                else:
+                    model = columnar.DATASETS[dataset]
+                    since = columnar.parse_since(options['since'] or state.get(dataset))
+                    until = columnar.watermark(model, since)
+                    rows = columnar.write_dataset(fmt, path, model, since, until, options['batch_size'])
+                    if until is not None:
+                        state[dataset] = until.isoformat()
+                self.stdout.write(f'{dataset}: {rows} rows -> {path} ({time.perf_counter() - started:.2f} s)')
+        except (columnar.ColumnarUnavailable, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        if state_file:
+            state_file.write_text(json.dumps(state, indent=2))
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+SOURCE_SUFFIXES = ('.png', '.jpg', '.jpeg')
+# {source stem: [[width, height], ...]} of the generated variants, read by templates for <img> sizes
+VARIANTS_FILE = 'variants.json'
+
+
+class Command(BaseCommand):
+    help = 'Generate resized PNG and WebP variants of the images in static/images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--widths', type=int, nargs='+', default=[256, 512],
+                            help='Output widths in pixels (use 1x and 2x of the largest display size)')
+        parser.add_argument('--quality', type=int, default=82, help='WebP quality (0-100)')
+
+    def handle(self, *args, **options):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise CommandError('Pillow is required: pip install Pillow')
+
+        image_dir = Path(settings.BASE_DIR) / 'static' / 'images'
+        widths = sorted(options['widths'])
+        sources = [
+            p for p in sorted(image_dir.iterdir())
+            if p.suffix.lower() in SOURCE_SUFFIXES and not p.stem.rsplit('-', 1)[-1].isdigit()
+        ]
+
+        variants = {}
+        for source in sources:
+            with Image.open(source) as image:
+                image.load()
+                variants[source.stem] = []
+                for width in widths:
+                    if width > image.width:
+                        continue
+                    height = round(image.height * width / image.width)
+                    resized = image.resize((width, height), Image.LANCZOS)
+                    variants[source.stem].append([width, height])
+
+                    webp_path = source.with_name(f'{source.stem}-{width}.webp')
+                    resized.save(webp_path, 'WEBP', quality=options['quality'], method=6)
+                    png_path = source.with_name(f'{source.stem}-{width}.png')
+                    resized.save(png_path, 'PNG', optimize=True)
+
+                    self.stdout.write(
+                        f'{source.name} -> {webp_path.name} ({webp_path.stat().st_size // 1024} KB), '
+                        f'{png_path.name} ({png_path.stat().st_size // 1024} KB)'
+                    )
+
+        (image_dir / VARIANTS_FILE).write_text(json.dumps(variants, indent=2) + '\n')
+        self.stdout.write(self.style.SUCCESS(f'Optimized {len(sources)} image(s)'))
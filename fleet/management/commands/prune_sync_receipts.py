@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from fleet import sync
+
+
+class Command(BaseCommand):
+    help = 'Delete offline-sync receipts older than --days; replays of those events are no longer deduplicated'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=sync.RECEIPT_RETENTION.days)
+
+    def handle(self, *args, **options):
+        deleted = sync.prune_receipts(timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} sync receipts older than {options["days"]} days.'))
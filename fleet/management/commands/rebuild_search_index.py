@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from fleet import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the global search index from vehicles, drivers and trips (after bulk loads that skip signals)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        total = search.rebuild(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} vehicles, drivers and trips.'))
@@ -1,3 +1,4 @@
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
 from fleet.models import User
 
@@ -20,12 +21,12 @@ class Command(BaseCommand):
                     'email': email,
                     'first_name': name.split()[0],
                     'last_name': name.split()[-1] if len(name.split()) > 1 else '',
-                    'role': role
+                    'role': role,
+                    # Hashed per user so every account gets its own salt
+                    'password': make_password('password123'),
                 }
             )
             if created:
-                user.set_password('password123')
-                user.save()
                 self.stdout.write(self.style.SUCCESS(f'Created user {email}'))
             else:
                 self.stdout.write(f'User {email} already exists')
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from fleet import events
+from fleet.models import FleetEvent
+
+
+class Command(BaseCommand):
+    help = 'Snapshot every vehicle, driver and trip status so point-in-time counts replay only later events'
+
+    def handle(self, *args, **options):
+        # Short of now, so transactions still in flight are not missed
+        at = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+        for entity_type in FleetEvent.EntityType.values:
+            taken = events.take_snapshot(entity_type, at)
+            self.stdout.write(f'{entity_type}: {taken} rows')
+        self.stdout.write(self.style.SUCCESS(f'Snapshot taken at {at:%Y-%m-%d %H:%M:%S}.'))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def snapshot_current_statuses(apps, schema_editor):
+    """Seed one event per existing entity so point-in-time queries have a baseline"""
+    FleetEvent = apps.get_model('fleet', 'FleetEvent')
+    now = django.utils.timezone.now()
+    for entity_type, model_name in (('VEHICLE', 'Vehicle'), ('DRIVER', 'Driver'), ('TRIP', 'Trip')):
+        model = apps.get_model('fleet', model_name)
+        batch = []
+        for pk, status in model.objects.order_by('pk').values_list('pk', 'status').iterator(chunk_size=2000):
+            batch.append(FleetEvent(entity_type=entity_type, entity_id=pk, to_status=status, occurred_at=now))
+            if len(batch) >= 2000:
+                FleetEvent.objects.bulk_create(batch)
+                batch = []
+        FleetEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0003_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FleetEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('VEHICLE', 'Vehicle'), ('DRIVER', 'Driver'), ('TRIP', 'Trip')], max_length=16)),
+                ('entity_id', models.BigIntegerField()),
+                ('from_status', models.CharField(blank=True, max_length=32)),
+                ('to_status', models.CharField(max_length=32)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-occurred_at', '-id'],
+                'indexes': [models.Index(fields=['entity_type', 'entity_id', 'occurred_at'], name='event_entity_time_idx'), models.Index(fields=['entity_type', 'occurred_at'], name='event_type_time_idx')],
+            },
+        ),
+        migrations.RunPython(snapshot_current_statuses, migrations.RunPython.noop),
+    ]
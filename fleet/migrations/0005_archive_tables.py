@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0004_fleet_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedExpense',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('vehicle_id', models.BigIntegerField(db_index=True)),
+                ('trip_id', models.BigIntegerField(blank=True, null=True)),
+                ('expense_type', models.CharField(choices=[('FUEL', 'Fuel'), ('MAINTENANCE', 'Maintenance'), ('REPAIR', 'Repair'), ('OTHER', 'Other')], max_length=32)),
+                ('amount', models.FloatField()),
+                ('liters', models.FloatField(blank=True, null=True)),
+                ('date', models.DateTimeField()),
+                ('description', models.CharField(blank=True, max_length=512)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTrip',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('vehicle_id', models.BigIntegerField(db_index=True)),
+                ('driver_id', models.BigIntegerField(db_index=True)),
+                ('cargo_weight', models.FloatField()),
+                ('origin', models.CharField(max_length=255)),
+                ('destination', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('DISPATCHED', 'Dispatched'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled')], max_length=32)),
+                ('start_odometer', models.FloatField(blank=True, null=True)),
+                ('end_odometer', models.FloatField(blank=True, null=True)),
+                ('start_date', models.DateTimeField(blank=True, null=True)),
+                ('end_date', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DriverArchiveRollup',
+            fields=[
+                ('driver', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive_rollup', serialize=False, to='fleet.driver')),
+                ('archived_trips', models.PositiveIntegerField(default=0)),
+                ('completed_trips', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VehicleArchiveRollup',
+            fields=[
+                ('vehicle', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive_rollup', serialize=False, to='fleet.vehicle')),
+                ('archived_trips', models.PositiveIntegerField(default=0)),
+                ('completed_trips', models.PositiveIntegerField(default=0)),
+                ('operational_cost', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['date'], name='expense_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['status', 'end_date'], name='trip_status_end_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:22
+
+import django.db.models.deletion
+import re
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def _normalize(name):
+    return ' '.join(re.sub(r'[^\w\s]', ' ', name or '').split()).casefold()
+
+
+def deduplicate_locations(apps, schema_editor):
+    """One Location per normalized origin/destination string; link every trip to it"""
+    Location = apps.get_model('fleet', 'Location')
+    Trip = apps.get_model('fleet', 'Trip')
+    ArchivedTrip = apps.get_model('fleet', 'ArchivedTrip')
+
+    # Most frequent spelling of each place becomes its display name
+    spellings = {}
+    for model in (Trip, ArchivedTrip):
+        for field in ('origin', 'destination'):
+            rows = model.objects.order_by().values_list(field).annotate(n=models.Count('id'))
+            for raw, n in rows:
+                display = ' '.join((raw or '').split())
+                spellings.setdefault(_normalize(display), Counter())[display] += n
+
+    Location.objects.bulk_create([
+        Location(name=counter.most_common(1)[0][0], normalized_name=key)
+        for key, counter in spellings.items()
+    ], batch_size=1000)
+    location_ids = dict(Location.objects.values_list('normalized_name', 'id'))
+
+    for model in (Trip, ArchivedTrip):
+        for field in ('origin', 'destination'):
+            raw_values = model.objects.order_by().values_list(field, flat=True).distinct()
+            for raw in raw_values.iterator():
+                location_id = location_ids[_normalize(' '.join((raw or '').split()))]
+                model.objects.filter(**{field: raw}).update(**{f'{field}_location_id': location_id})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0005_archive_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('normalized_name', models.CharField(max_length=255, unique=True)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedtrip',
+            name='destination_location_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedtrip',
+            name='origin_location_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='destination_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='fleet.location'),
+        ),
+        migrations.AddField(
+            model_name='trip',
+            name='origin_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='fleet.location'),
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['origin_location', 'destination_location'], name='trip_lane_idx'),
+        ),
+        migrations.RunPython(deduplicate_locations, migrations.RunPython.noop),
+    ]
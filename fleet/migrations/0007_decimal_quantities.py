@@ -0,0 +1,112 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:25
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Round
+
+
+ROUNDED_FIELDS = {
+    'Vehicle': ['max_load_capacity', 'odometer'],
+    'Trip': ['cargo_weight', 'start_odometer', 'end_odometer'],
+    'Expense': ['amount', 'liters'],
+    'MaintenanceLog': ['cost'],
+    'ArchivedTrip': ['cargo_weight', 'start_odometer', 'end_odometer'],
+    'ArchivedExpense': ['amount', 'liters'],
+    'VehicleArchiveRollup': ['operational_cost'],
+}
+
+
+def round_to_scale(apps, schema_editor):
+    """Round stored floats to each column's scale with one UPDATE per table.
+
+    PostgreSQL already rounds in the ALTER COLUMN cast; SQLite keeps the old
+    values as they were, so this makes both backends hold the same amounts.
+    """
+    for model_name, field_names in ROUNDED_FIELDS.items():
+        model = apps.get_model('fleet', model_name)
+        model.objects.update(**{
+            name: Round(F(name), model._meta.get_field(name).decimal_places)
+            for name in field_names
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0006_locations'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedexpense',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='archivedexpense',
+            name='liters',
+            field=models.DecimalField(blank=True, decimal_places=3, max_digits=10, null=True),
+        ),
+        migrations.AlterField(
+            model_name='archivedtrip',
+            name='cargo_weight',
+            field=models.DecimalField(decimal_places=2, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='archivedtrip',
+            name='end_odometer',
+            field=models.DecimalField(blank=True, decimal_places=1, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='archivedtrip',
+            name='start_odometer',
+            field=models.DecimalField(blank=True, decimal_places=1, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='expense',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, max_digits=12, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='expense',
+            name='liters',
+            field=models.DecimalField(blank=True, decimal_places=3, max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='maintenancelog',
+            name='cost',
+            field=models.DecimalField(decimal_places=2, max_digits=12, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='cargo_weight',
+            field=models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='end_odometer',
+            field=models.DecimalField(blank=True, decimal_places=1, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='start_odometer',
+            field=models.DecimalField(blank=True, decimal_places=1, max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='vehicle',
+            name='max_load_capacity',
+            field=models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='vehicle',
+            name='odometer',
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=12, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterField(
+            model_name='vehiclearchiverollup',
+            name='operational_cost',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=16),
+        ),
+        migrations.RunPython(round_to_scale, migrations.RunPython.noop),
+    ]
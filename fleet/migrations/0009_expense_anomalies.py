@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0008_tombstones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnomalyScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scored_through', models.DateTimeField(blank=True, null=True)),
+                ('scored', models.PositiveIntegerField(default=0)),
+                ('flagged', models.PositiveIntegerField(default=0)),
+                ('finished_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-finished_at', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExpenseAnomaly',
+            fields=[
+                ('expense', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='anomaly', serialize=False, to='fleet.expense')),
+                ('score', models.FloatField()),
+                ('reasons', models.CharField(max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-score'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['vehicle', 'expense_type', 'date'], name='expense_vehicle_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expenseanomaly',
+            index=models.Index(fields=['updated_at'], name='anomaly_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:48
+
+from django.db import migrations, models
+
+
+SQLITE_FORWARDS = [
+    # External-content FTS5 table; triggers copy every fleet_searchentry change into it
+    "CREATE VIRTUAL TABLE fleet_search_fts USING fts5(document, content='fleet_searchentry', content_rowid='id', tokenize='trigram')",
+    """CREATE TRIGGER fleet_search_fts_ai AFTER INSERT ON fleet_searchentry BEGIN
+        INSERT INTO fleet_search_fts(rowid, document) VALUES (new.id, new.document);
+    END""",
+    """CREATE TRIGGER fleet_search_fts_ad AFTER DELETE ON fleet_searchentry BEGIN
+        INSERT INTO fleet_search_fts(fleet_search_fts, rowid, document) VALUES ('delete', old.id, old.document);
+    END""",
+    """CREATE TRIGGER fleet_search_fts_au AFTER UPDATE ON fleet_searchentry BEGIN
+        INSERT INTO fleet_search_fts(fleet_search_fts, rowid, document) VALUES ('delete', old.id, old.document);
+        INSERT INTO fleet_search_fts(rowid, document) VALUES (new.id, new.document);
+    END""",
+]
+SQLITE_BACKWARDS = [
+    'DROP TRIGGER IF EXISTS fleet_search_fts_ai',
+    'DROP TRIGGER IF EXISTS fleet_search_fts_ad',
+    'DROP TRIGGER IF EXISTS fleet_search_fts_au',
+    'DROP TABLE IF EXISTS fleet_search_fts',
+]
+POSTGRES_FORWARDS = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    # Matches the UPPER(document) LIKE UPPER(%s) that icontains compiles to
+    'CREATE INDEX search_document_trgm_idx ON fleet_searchentry USING gin (UPPER(document) gin_trgm_ops)',
+]
+POSTGRES_BACKWARDS = [
+    'DROP INDEX IF EXISTS search_document_trgm_idx',
+]
+
+# Searchable fields per model, as in fleet.search.DOCUMENT_FIELDS
+DOCUMENT_FIELDS = {
+    'Vehicle': ('VEHICLE', ('license_plate', 'name', 'model_name')),
+    'Driver': ('DRIVER', ('name', 'email', 'license_number')),
+    'Trip': ('TRIP', ('origin', 'destination')),
+}
+
+
+def _run(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def create_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARDS)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARDS)
+
+
+def drop_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_BACKWARDS)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_BACKWARDS)
+
+
+def index_existing_rows(apps, schema_editor):
+    SearchEntry = apps.get_model('fleet', 'SearchEntry')
+    for model_name, (kind, fields) in DOCUMENT_FIELDS.items():
+        rows = apps.get_model('fleet', model_name).objects.order_by().values_list('pk', *fields)
+        batch = []
+        for pk, *values in rows.iterator(chunk_size=2000):
+            batch.append(SearchEntry(kind=kind, object_id=pk, document=' '.join(value or '' for value in values)))
+            if len(batch) == 2000:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0010_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('VEHICLE', 'Vehicle'), ('DRIVER', 'Driver'), ('TRIP', 'Trip')], max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('document', models.TextField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_entry_object_uniq')],
+            },
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+        migrations.RunPython(index_existing_rows, migrations.RunPython.noop),
+    ]
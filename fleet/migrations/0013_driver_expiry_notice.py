@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0012_sync_receipts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='driver',
+            name='expiry_notice_for',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:10
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_fuel_cost(apps, schema_editor):
+    """Fuel already moved to the archive, so fleet fuel totals keep full history"""
+    ArchivedExpense = apps.get_model('fleet', 'ArchivedExpense')
+    VehicleArchiveRollup = apps.get_model('fleet', 'VehicleArchiveRollup')
+    totals = (
+        ArchivedExpense.objects.order_by()
+        .filter(expense_type='FUEL')
+        .values_list('vehicle_id')
+        .annotate(total=Sum('amount'))
+    )
+    for vehicle_id, total in totals:
+        VehicleArchiveRollup.objects.filter(vehicle_id=vehicle_id).update(fuel_cost=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0014_table_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehiclearchiverollup',
+            name='fuel_cost',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=16),
+        ),
+        migrations.RunPython(backfill_fuel_cost, migrations.RunPython.noop),
+    ]
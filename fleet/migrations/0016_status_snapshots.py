@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fleet', '0015_archive_fuel_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('VEHICLE', 'Vehicle'), ('DRIVER', 'Driver'), ('TRIP', 'Trip')], max_length=16)),
+                ('entity_id', models.BigIntegerField()),
+                ('status', models.CharField(max_length=32)),
+                ('taken_at', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'taken_at', 'entity_id'), name='status_snapshot_uniq')],
+            },
+        ),
+    ]
@@ -1,3 +1,5 @@
+import re
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator
@@ -12,11 +14,39 @@ class User(AbstractUser):
         SAFETY_OFFICER = 'SAFETY_OFFICER', 'Safety Officer'
         FINANCIAL_ANALYST = 'FINANCIAL_ANALYST', 'Financial Analyst'
 
+        @property
+        def permissions(self):
+            return ROLE_PERMISSIONS[self]
+
     role = models.CharField(max_length=32, choices=Role.choices, default=Role.FLEET_MANAGER)
 
     def __str__(self):
         return self.get_full_name() or self.username
 
+    def has_role_perm(self, perm):
+        """Role-based check against the precomputed ROLE_PERMISSIONS map"""
+        return perm in ROLE_PERMISSIONS.get(self.role, frozenset())
+
+
+# Role-based permissions, built once at import time
+PERM_VIEW_FLEET = 'view_fleet'
+PERM_MANAGE_VEHICLES = 'manage_vehicles'
+PERM_MANAGE_TRIPS = 'manage_trips'
+PERM_MANAGE_MAINTENANCE = 'manage_maintenance'
+PERM_MANAGE_DRIVERS = 'manage_drivers'
+PERM_MANAGE_EXPENSES = 'manage_expenses'
+PERM_VIEW_FINANCE = 'view_finance'
+
+ROLE_PERMISSIONS = {
+    User.Role.FLEET_MANAGER: frozenset({
+        PERM_VIEW_FLEET, PERM_MANAGE_VEHICLES, PERM_MANAGE_TRIPS, PERM_MANAGE_MAINTENANCE,
+        PERM_MANAGE_DRIVERS, PERM_MANAGE_EXPENSES, PERM_VIEW_FINANCE,
+    }),
+    User.Role.DISPATCHER: frozenset({PERM_VIEW_FLEET, PERM_MANAGE_TRIPS}),
+    User.Role.SAFETY_OFFICER: frozenset({PERM_VIEW_FLEET, PERM_MANAGE_DRIVERS, PERM_MANAGE_MAINTENANCE}),
+    User.Role.FINANCIAL_ANALYST: frozenset({PERM_VIEW_FLEET, PERM_MANAGE_EXPENSES, PERM_VIEW_FINANCE}),
+}
+
 
 class Vehicle(models.Model):
     """Vehicle/Fleet asset model"""
@@ -35,8 +65,8 @@ class Vehicle(models.Model):
     model_name = models.CharField(max_length=255)
     license_plate = models.CharField(max_length=32, unique=True)
     vehicle_type = models.CharField(max_length=16, choices=Type.choices)
-    max_load_capacity = models.FloatField(validators=[MinValueValidator(0)])
-    odometer = models.FloatField(default=0, validators=[MinValueValidator(0)])
+    max_load_capacity = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    odometer = models.DecimalField(max_digits=12, decimal_places=1, default=0, validators=[MinValueValidator(0)])
     status = models.CharField(max_length=32, choices=Status.choices, default=Status.AVAILABLE)
     is_out_of_service = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -44,6 +74,9 @@ class Vehicle(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='vehicle_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.license_plate})"
@@ -65,11 +98,17 @@ class Driver(models.Model):
     status = models.CharField(max_length=16, choices=Status.choices, default=Status.OFF_DUTY)
     safety_score = models.FloatField(default=100)
     trip_completion_rate = models.FloatField(default=0)
+    # license_expiry the last expiry warning was sent for; a renewal makes the driver eligible again
+    expiry_notice_for = models.DateField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='driver_updated_idx'),
+            models.Index(fields=['license_expiry', 'status'], name='driver_expiry_status_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -79,6 +118,51 @@ class Driver(models.Model):
         return self.license_expiry < timezone.now().date()
 
 
+def normalize_location_name(name):
+    """Case-, whitespace- and punctuation-insensitive key for a place name"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', name or '').split()).casefold()
+
+
+class LocationManager(models.Manager):
+    def resolve(self, name):
+        """Location for free-text ``name``, created on first use"""
+        display = ' '.join((name or '').split())
+        location, _ = self.get_or_create(
+            normalized_name=normalize_location_name(display),
+            defaults={'name': display},
+        )
+        return location
+
+    def prefix_search(self, query, limit=10):
+        """Names starting with ``query`` - ``LIKE 'prefix%'``, served by the normalized_name pattern index"""
+        prefix = normalize_location_name(query)
+        if not prefix:
+            return self.none()
+        return self.filter(normalized_name__startswith=prefix).order_by('normalized_name')[:limit]
+
+
+class Location(models.Model):
+    """Normalized trip origin/destination"""
+    name = models.CharField(max_length=255)
+    normalized_name = models.CharField(max_length=255, unique=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = LocationManager()
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_location_name(self.name)
+        super().save(*args, **kwargs)
+
+
 class Trip(models.Model):
     """Trip lifecycle management"""
     class Status(models.TextChoices):
@@ -89,12 +173,14 @@ class Trip(models.Model):
 
     vehicle = models.ForeignKey(Vehicle, on_delete=models.PROTECT, related_name='trips')
     driver = models.ForeignKey(Driver, on_delete=models.PROTECT, related_name='trips')
-    cargo_weight = models.FloatField(validators=[MinValueValidator(0)])
+    cargo_weight = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     origin = models.CharField(max_length=255)
     destination = models.CharField(max_length=255)
+    origin_location = models.ForeignKey(Location, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    destination_location = models.ForeignKey(Location, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
     status = models.CharField(max_length=32, choices=Status.choices, default=Status.DRAFT)
-    start_odometer = models.FloatField(null=True, blank=True)
-    end_odometer = models.FloatField(null=True, blank=True)
+    start_odometer = models.DecimalField(max_digits=12, decimal_places=1, null=True, blank=True)
+    end_odometer = models.DecimalField(max_digits=12, decimal_places=1, null=True, blank=True)
     start_date = models.DateTimeField(null=True, blank=True)
     end_date = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -102,6 +188,12 @@ class Trip(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='trip_updated_idx'),
+            models.Index(fields=['origin_location', 'destination_location'], name='trip_lane_idx'),
+            models.Index(fields=['status', 'end_date'], name='trip_status_end_idx'),
+            models.Index(fields=['created_at'], name='trip_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.origin} → {self.destination}"
@@ -118,8 +210,8 @@ class Expense(models.Model):
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='expenses')
     trip = models.ForeignKey(Trip, on_delete=models.SET_NULL, null=True, blank=True, related_name='expenses')
     expense_type = models.CharField(max_length=32, choices=Type.choices)
-    amount = models.FloatField(validators=[MinValueValidator(0)])
-    liters = models.FloatField(null=True, blank=True, validators=[MinValueValidator(0)])
+    amount = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(0)])
+    liters = models.DecimalField(max_digits=10, decimal_places=3, null=True, blank=True, validators=[MinValueValidator(0)])
     date = models.DateTimeField()
     description = models.CharField(max_length=512, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -127,6 +219,11 @@ class Expense(models.Model):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='expense_updated_idx'),
+            models.Index(fields=['date'], name='expense_date_idx'),
+            models.Index(fields=['vehicle', 'expense_type', 'date'], name='expense_vehicle_type_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.vehicle} - {self.expense_type} - {self.amount}"
@@ -141,7 +238,7 @@ class MaintenanceLog(models.Model):
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='maintenance_logs')
     service_type = models.CharField(max_length=32, choices=ServiceType.choices)
     description = models.CharField(max_length=512)
-    cost = models.FloatField(validators=[MinValueValidator(0)])
+    cost = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(0)])
     date = models.DateTimeField()
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -149,6 +246,227 @@ class MaintenanceLog(models.Model):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='maintenance_updated_idx'),
+            models.Index(fields=['date'], name='maintenance_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.vehicle} - {self.description}"
+
+
+class ExpenseAnomaly(models.Model):
+    """Fuel expense that scored far outside its vehicle's recent baseline"""
+    expense = models.OneToOneField(Expense, on_delete=models.CASCADE, primary_key=True, related_name='anomaly')
+    score = models.FloatField()
+    reasons = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['updated_at'], name='anomaly_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"Expense #{self.expense_id}: {self.reasons}"
+
+
+class AnomalyScan(models.Model):
+    """One run of the anomaly detector; the latest one is the incremental watermark"""
+    scored_through = models.DateTimeField(null=True, blank=True)
+    scored = models.PositiveIntegerField(default=0)
+    flagged = models.PositiveIntegerField(default=0)
+    finished_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-finished_at', '-id']
+
+    def __str__(self):
+        return f"Scan {self.finished_at:%Y-%m-%d %H:%M}: {self.flagged}/{self.scored} flagged"
+
+
+class FleetEvent(models.Model):
+    """Append-only log of vehicle/driver/trip status transitions"""
+    class EntityType(models.TextChoices):
+        VEHICLE = 'VEHICLE', 'Vehicle'
+        DRIVER = 'DRIVER', 'Driver'
+        TRIP = 'TRIP', 'Trip'
+
+    entity_type = models.CharField(max_length=16, choices=EntityType.choices)
+    # Plain id rather than a FK so history survives deletes of the entity
+    entity_id = models.BigIntegerField()
+    from_status = models.CharField(max_length=32, blank=True)
+    to_status = models.CharField(max_length=32)
+    occurred_at = models.DateTimeField(default=timezone.now)
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    class Meta:
+        ordering = ['-occurred_at', '-id']
+        indexes = [
+            models.Index(fields=['entity_type', 'entity_id', 'occurred_at'], name='event_entity_time_idx'),
+            models.Index(fields=['entity_type', 'occurred_at'], name='event_type_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} #{self.entity_id}: {self.from_status or '-'} → {self.to_status}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('FleetEvent rows are append-only and cannot be updated.')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError('FleetEvent rows are append-only and cannot be deleted.')
+
+
+class StatusSnapshot(models.Model):
+    """Status of every vehicle, driver or trip at ``taken_at``, so point-in-time counts replay only later events"""
+    entity_type = models.CharField(max_length=16, choices=FleetEvent.EntityType.choices)
+    entity_id = models.BigIntegerField()
+    status = models.CharField(max_length=32)
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'taken_at', 'entity_id'], name='status_snapshot_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} #{self.entity_id}: {self.status} at {self.taken_at:%Y-%m-%d %H:%M}"
+
+
+class Tombstone(models.Model):
+    """Marker left behind when a row is deleted, so the change feed can report it"""
+    # Model name of the deleted row, e.g. 'vehicle'
+    model = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['model', 'deleted_at', 'id'], name='tombstone_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+
+class TableVersion(models.Model):
+    """Counter bumped whenever rows of a table are deleted; part of page ETags (see fleet/caching.py)"""
+    # Model label, e.g. 'fleet.vehicle'
+    table = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
+
+
+class SearchEntry(models.Model):
+    """Searchable text of one vehicle, driver or trip (see fleet/search.py)"""
+    class Kind(models.TextChoices):
+        VEHICLE = 'VEHICLE', 'Vehicle'
+        DRIVER = 'DRIVER', 'Driver'
+        TRIP = 'TRIP', 'Trip'
+
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    document = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_object_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.document}"
+
+
+class SyncReceipt(models.Model):
+    """Result of one applied offline event, keyed by its client-generated id (see fleet/sync.py)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    key = models.CharField(max_length=64)
+    kind = models.CharField(max_length=16)
+    result = models.JSONField()
+    applied_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='sync_receipt_key_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['applied_at'], name='sync_receipt_applied_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.key} applied {self.applied_at:%Y-%m-%d %H:%M}"
+
+
+# ==================== ARCHIVE ====================
+class ArchivedTrip(models.Model):
+    """Completed/cancelled trip moved out of the hot Trip table (same id)"""
+    id = models.BigIntegerField(primary_key=True)
+    vehicle_id = models.BigIntegerField(db_index=True)
+    driver_id = models.BigIntegerField(db_index=True)
+    cargo_weight = models.DecimalField(max_digits=10, decimal_places=2)
+    origin = models.CharField(max_length=255)
+    destination = models.CharField(max_length=255)
+    origin_location_id = models.BigIntegerField(null=True, blank=True)
+    destination_location_id = models.BigIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=32, choices=Trip.Status.choices)
+    start_odometer = models.DecimalField(max_digits=12, decimal_places=1, null=True, blank=True)
+    end_odometer = models.DecimalField(max_digits=12, decimal_places=1, null=True, blank=True)
+    start_date = models.DateTimeField(null=True, blank=True)
+    end_date = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='archived_trip_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.origin} → {self.destination} (archived)"
+
+
+class ArchivedExpense(models.Model):
+    """Expense moved out of the hot Expense table (same id)"""
+    id = models.BigIntegerField(primary_key=True)
+    vehicle_id = models.BigIntegerField(db_index=True)
+    trip_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    expense_type = models.CharField(max_length=32, choices=Expense.Type.choices)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    liters = models.DecimalField(max_digits=10, decimal_places=3, null=True, blank=True)
+    date = models.DateTimeField()
+    description = models.CharField(max_length=512, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.vehicle_id} - {self.expense_type} - {self.amount} (archived)"
+
+
+class VehicleArchiveRollup(models.Model):
+    """Running totals of everything archived for a vehicle, added back into reports"""
+    vehicle = models.OneToOneField(Vehicle, on_delete=models.CASCADE, primary_key=True, related_name='archive_rollup')
+    archived_trips = models.PositiveIntegerField(default=0)
+    completed_trips = models.PositiveIntegerField(default=0)
+    operational_cost = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    fuel_cost = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class DriverArchiveRollup(models.Model):
+    """Archived trip counts per driver, so completion rates keep full history"""
+    driver = models.OneToOneField(Driver, on_delete=models.CASCADE, primary_key=True, related_name='archive_rollup')
+    archived_trips = models.PositiveIntegerField(default=0)
+    completed_trips = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,53 @@
+"""
+Paginator for admin changelists over very large tables.
+
+Django's ``Paginator.count`` runs ``SELECT COUNT(*)`` over the whole table,
+which dominates an unfiltered changelist once a table holds millions of
+rows. For unfiltered querysets ``EstimatedCountPaginator`` reads the
+planner's row estimate instead: ``pg_class.reltuples`` on PostgreSQL, and
+``sqlite_stat1`` on SQLite once ``ANALYZE`` has run. Filtered querysets,
+small tables and backends without statistics still get an exact count.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+# Below this many rows an exact COUNT(*) is cheap and the page links stay exact
+ESTIMATE_ABOVE = 100_000
+
+
+def estimated_row_count(model, using='default'):
+    """The database's statistics estimate of ``model``'s row count, or None"""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    # sqlite_stat1.stat is "<rows> <rows per key>..."; reltuples is -1 before the first ANALYZE
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts table statistics for unfiltered querysets over ``ESTIMATE_ABOVE`` rows"""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where and not queryset.query.distinct:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > ESTIMATE_ABOVE:
+                return estimate
+        return super().count
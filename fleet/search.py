@@ -0,0 +1,125 @@
+"""
+Global search over vehicles, drivers and trips.
+
+Each searchable object has one ``SearchEntry`` holding its searchable
+fields as a single ``document``. Signals keep the entries current, and
+``rebuild_search_index`` refills them after bulk loads that skip signals.
+A search returns entries that contain every term as a case-insensitive
+substring, so ``123`` finds plate ``ABC-1234``. Each backend serves that
+from a trigram index:
+
+* PostgreSQL: a ``pg_trgm`` GIN index on ``UPPER(document)``, which the
+  ``icontains`` filters compile to.
+* SQLite: the FTS5 table ``fleet_search_fts`` with the trigram tokenizer.
+  Triggers on ``fleet_searchentry`` keep it in sync.
+
+A trigram index cannot serve terms shorter than three characters, so those
+terms are ignored.
+"""
+from django.db import connection, transaction
+
+from .models import Vehicle, Driver, Trip, SearchEntry
+
+
+DOCUMENT_FIELDS = {
+    Vehicle: ('license_plate', 'name', 'model_name'),
+    Driver: ('name', 'email', 'license_number'),
+    Trip: ('origin', 'destination'),
+}
+KINDS = {
+    Vehicle: SearchEntry.Kind.VEHICLE,
+    Driver: SearchEntry.Kind.DRIVER,
+    Trip: SearchEntry.Kind.TRIP,
+}
+MIN_TERM_LENGTH = 3
+MAX_TERMS = 5
+DEFAULT_LIMIT = 50
+FTS_TABLE = 'fleet_search_fts'
+
+
+def document(instance):
+    return ' '.join(getattr(instance, field) or '' for field in DOCUMENT_FIELDS[type(instance)])
+
+
+def index(instance, created=False, update_fields=None):
+    """Write ``instance``'s entry; saves that touch no searchable field cost nothing"""
+    fields = DOCUMENT_FIELDS[type(instance)]
+    if update_fields is not None and not set(update_fields) & set(fields):
+        return
+    kind, text = KINDS[type(instance)], document(instance)
+    if created:
+        SearchEntry.objects.create(kind=kind, object_id=instance.pk, document=text)
+        return
+    entry = SearchEntry.objects.filter(kind=kind, object_id=instance.pk)
+    # Status-only saves match no row here and write nothing
+    if entry.exclude(document=text).update(document=text) or entry.exists():
+        return
+    # Rows that never got an entry (bulk_create, imports, an interrupted rebuild)
+    SearchEntry.objects.update_or_create(kind=kind, object_id=instance.pk, defaults={'document': text})
+
+
+def unindex(instance):
+    unindex_ids(type(instance), [instance.pk])
+
+
+def unindex_ids(model, ids):
+    """Drop the entries of ``model`` rows ``ids`` with one ``DELETE``"""
+    SearchEntry.objects.filter(kind=KINDS[model], object_id__in=ids).delete()
+
+
+def rebuild(batch_size=2000):
+    """Recreate every entry from the source tables; returns the number indexed"""
+    total = 0
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        for model, fields in DOCUMENT_FIELDS.items():
+            batch = []
+            for pk, *values in model.objects.order_by().values_list('pk', *fields).iterator(chunk_size=batch_size):
+                batch.append(SearchEntry(kind=KINDS[model], object_id=pk, document=' '.join(v or '' for v in values)))
+                if len(batch) == batch_size:
+                    total += len(SearchEntry.objects.bulk_create(batch))
+                    batch = []
+            total += len(SearchEntry.objects.bulk_create(batch))
+    return total
+
+
+def terms(query):
+    """Usable search terms in ``query``"""
+    return [term for term in query.split() if len(term) >= MIN_TERM_LENGTH][:MAX_TERMS]
+
+
+def matching_entries(search_terms, limit=DEFAULT_LIMIT):
+    """Up to ``limit`` entries containing every term"""
+    if not search_terms:
+        return []
+    if connection.vendor == 'sqlite':
+        # Each quoted term is a trigram phrase, i.e. a substring match
+        match = ' AND '.join('"{}"'.format(term.replace('"', '""')) for term in search_terms)
+        return list(SearchEntry.objects.raw(
+            f'SELECT e.id, e.kind, e.object_id, e.document FROM {FTS_TABLE} f '
+            'JOIN fleet_searchentry e ON e.id = f.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s LIMIT %s',
+            [match, limit],
+        ))
+    entries = SearchEntry.objects.order_by()
+    for term in search_terms:
+        entries = entries.filter(document__icontains=term)
+    return list(entries[:limit])
+
+
+def search(query, limit=DEFAULT_LIMIT):
+    """{'vehicles', 'drivers', 'trips'} lists of objects matching every term in ``query``"""
+    search_terms = terms(query)
+    ids = {kind: [] for kind in SearchEntry.Kind.values}
+    for entry in matching_entries(search_terms, limit):
+        ids[entry.kind].append(entry.object_id)
+
+    def load(queryset, kind):
+        found = queryset.in_bulk(ids[kind])
+        return [found[pk] for pk in ids[kind] if pk in found]
+
+    return {
+        'vehicles': load(Vehicle.objects.all(), SearchEntry.Kind.VEHICLE),
+        'drivers': load(Driver.objects.all(), SearchEntry.Kind.DRIVER),
+        'trips': load(Trip.objects.select_related('vehicle', 'driver'), SearchEntry.Kind.TRIP),
+    }
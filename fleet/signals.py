@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .auth import invalidate_cached_user
+from .caching import bump_table_version
+from .models import Driver, Expense, Location, MaintenanceLog, Tombstone, Trip, User, Vehicle
+
+
+# True while archive_history moves rows out; see archiving()
+_archiving = ContextVar('archiving', default=False)
+
+
+@contextmanager
+def archiving():
+    """Rows deleted inside this block moved to the archive tables rather than going away.
+
+    The per-row delete receivers below skip them: no tombstone (the change
+    feed's last upsert of a finished trip or old expense stays true), and no
+    per-row version bump or search delete. The archiver does those once per
+    batch instead.
+    """
+    token = _archiving.set(True)
+    try:
+        yield
+    finally:
+        _archiving.reset(token)
+
+
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_delete, sender=Driver)
+@receiver(post_delete, sender=Trip)
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=MaintenanceLog)
+@receiver(post_delete, sender=Location)
+def record_delete(sender, **kwargs):
+    """Deletes do not move max(updated_at), so count them for page ETags"""
+    if not _archiving.get():
+        bump_table_version(sender)
+
+
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_delete, sender=Driver)
+@receiver(post_delete, sender=Trip)
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=MaintenanceLog)
+def leave_tombstone(sender, instance, **kwargs):
+    """Written in the deleting transaction so the change feed never misses a delete"""
+    if not _archiving.get():
+        Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
+
+
+@receiver(post_save, sender=Vehicle)
+@receiver(post_save, sender=Driver)
+@receiver(post_save, sender=Trip)
+def update_search_entry(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the global search index in step with plates, names and routes"""
+    search.index(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=Vehicle)
+@receiver(post_delete, sender=Driver)
+@receiver(post_delete, sender=Trip)
+def drop_search_entry(sender, instance, **kwargs):
+    if not _archiving.get():
+        search.unindex(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, **kwargs):
+    """Role, password or active-flag changes must reach the next request"""
+    invalidate_cached_user(instance.pk)
@@ -0,0 +1,305 @@
+"""
+Batched, idempotent sync of trip events recorded offline.
+
+A driver's device queues events while out of coverage and posts them in one
+batch when it reconnects. Every event carries a client-generated ``id``
+(e.g. a UUID), a ``type`` and optionally ``at``, the ISO 8601 time it
+happened on the device (default: now):
+
+* ``dispatch``: ``trip``, ``start_odometer``
+* ``complete``: ``trip``, ``end_odometer``
+* ``fuel``: ``amount``, ``trip`` and/or ``vehicle``, optionally ``liters`` and ``description``
+
+The batch is applied in order in one transaction. Each event is fully
+checked before it writes anything, so a rejected event (bad input, missing
+permission, a trip in the wrong status) is reported and changes nothing,
+and the events after it still apply. An applied event leaves a
+``SyncReceipt`` keyed by ``(user, id)``.
+Replaying that id, e.g. when the device retries after losing the response,
+returns the stored result as ``duplicate`` and changes nothing. Rejected
+events leave no receipt, so they can be sent again.
+
+The trips, vehicles and drivers a batch names are loaded and locked up
+front with one query per table. Driver completion rates are recomputed and
+status events written once per batch, so a batch of hundreds of events
+costs a few writes per event.
+Fuel expenses are scored by the ``detect_expense_anomalies`` job.
+"""
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import events
+from .models import (
+    Vehicle, Driver, Trip, Expense, DriverArchiveRollup, SyncReceipt, PERM_MANAGE_TRIPS, PERM_MANAGE_EXPENSES,
+)
+
+
+MAX_BATCH_SIZE = 500
+MAX_KEY_LENGTH = SyncReceipt._meta.get_field('key').max_length
+APPLIED, DUPLICATE, REJECTED = 'applied', 'duplicate', 'rejected'
+# event type -> role permission needed to apply it
+EVENT_PERMISSIONS = {
+    'dispatch': PERM_MANAGE_TRIPS,
+    'complete': PERM_MANAGE_TRIPS,
+    'fuel': PERM_MANAGE_EXPENSES,
+}
+RECEIPT_RETENTION = timedelta(days=90)
+
+
+class InvalidBatch(ValueError):
+    pass
+
+
+class Rejected(Exception):
+    pass
+
+
+def _id(event, field):
+    value = event.get(field)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)) or not str(value).isdigit():
+        raise Rejected(f'{field} must be an id')
+    return int(value)
+
+
+def _decimal(event, field, model_field, required=True):
+    """``event[field]`` as a Decimal that fits ``model_field``"""
+    value = event.get(field)
+    if value in (None, ''):
+        if required:
+            raise Rejected(f'{field} is required')
+        return None
+    try:
+        number = Decimal(str(value))
+    except InvalidOperation:
+        raise Rejected(f'{field} must be a number')
+    places = model_field.decimal_places
+    if not number.is_finite() or number < 0 or number >= 10 ** (model_field.max_digits - places):
+        raise Rejected(f'{field} is out of range')
+    return number.quantize(Decimal(1).scaleb(-places))
+
+
+def _occurred_at(event, now):
+    """Device time of the event, capped at ``now`` so a fast clock cannot date it in the future"""
+    value = event.get('at')
+    if not value:
+        return now
+    try:
+        at = parse_datetime(str(value))
+    except ValueError:
+        at = None
+    if at is None or timezone.is_naive(at):
+        raise Rejected('at must be an ISO 8601 timestamp with a UTC offset')
+    return min(at, now)
+
+
+def _check_batch(batch):
+    if not isinstance(batch, list):
+        raise InvalidBatch('Expected {"events": [...]}.')
+    if len(batch) > MAX_BATCH_SIZE:
+        raise InvalidBatch(f'At most {MAX_BATCH_SIZE} events per batch.')
+    for position, event in enumerate(batch):
+        key = event.get('id') if isinstance(event, dict) else None
+        if not isinstance(key, str) or not 0 < len(key) <= MAX_KEY_LENGTH:
+            raise InvalidBatch(f'Event {position} needs a string id of at most {MAX_KEY_LENGTH} characters.')
+
+
+def _lock(batch):
+    """(trips, vehicles, drivers) by pk for every object ``batch`` refers to, locked in pk order"""
+    trip_ids, vehicle_ids = set(), set()
+    for event in batch:
+        try:
+            trip_ids.add(_id(event, 'trip'))
+            vehicle_ids.add(_id(event, 'vehicle'))
+        except Rejected:
+            pass
+    trips = Trip.objects.select_for_update().order_by('pk').in_bulk(trip_ids - {None})
+    vehicle_ids |= {trip.vehicle_id for trip in trips.values()}
+    vehicles = Vehicle.objects.select_for_update().order_by('pk').in_bulk(vehicle_ids - {None})
+    drivers = Driver.objects.select_for_update().order_by('pk').in_bulk({trip.driver_id for trip in trips.values()})
+    for trip in trips.values():
+        # One shared instance per row, so later events see earlier events' changes
+        trip.vehicle = vehicles[trip.vehicle_id]
+        trip.driver = drivers[trip.driver_id]
+    return trips, vehicles, drivers
+
+
+class _Batch:
+    def __init__(self, user, trips, vehicles, now):
+        self.user = user
+        self.trips = trips
+        self.vehicles = vehicles
+        self.now = now
+        self.completed_drivers = {}
+        self.changes = []
+
+    def trip(self, event):
+        pk = _id(event, 'trip')
+        if pk is None:
+            raise Rejected('trip is required')
+        if pk not in self.trips:
+            raise Rejected(f'trip {pk} does not exist')
+        return self.trips[pk]
+
+    def dispatch(self, event):
+        trip = self.trip(event)
+        start_odometer = _decimal(event, 'start_odometer', Trip._meta.get_field('start_odometer'))
+        at = _occurred_at(event, self.now)
+        if trip.status != Trip.Status.DRAFT:
+            raise Rejected(f'trip {trip.pk} is {trip.get_status_display()}; only draft trips can be dispatched')
+        if trip.vehicle.status != Vehicle.Status.AVAILABLE:
+            raise Rejected(f'vehicle {trip.vehicle_id} is {trip.vehicle.get_status_display()}')
+
+        trip.status = Trip.Status.DISPATCHED
+        trip.start_odometer = start_odometer
+        trip.start_date = at
+        trip.save(update_fields=['status', 'start_odometer', 'start_date', 'updated_at'])
+        self.changes.append(events.trip_transition(trip, Trip.Status.DRAFT, self.user, at))
+
+        previous_status = trip.vehicle.status
+        trip.vehicle.status = Vehicle.Status.ON_TRIP
+        trip.vehicle.save(update_fields=['status', 'updated_at'])
+        self.changes.append(events.vehicle_transition(trip.vehicle, previous_status, self.user, at))
+
+        previous_status = trip.driver.status
+        trip.driver.status = Driver.Status.ON_DUTY
+        trip.driver.save(update_fields=['status', 'updated_at'])
+        self.changes.append(events.driver_transition(trip.driver, previous_status, self.user, at))
+        return {'trip': trip.pk}
+
+    def complete(self, event):
+        trip = self.trip(event)
+        end_odometer = _decimal(event, 'end_odometer', Trip._meta.get_field('end_odometer'))
+        at = _occurred_at(event, self.now)
+        if trip.status != Trip.Status.DISPATCHED:
+            raise Rejected(f'trip {trip.pk} is {trip.get_status_display()}; only dispatched trips can be completed')
+        if trip.start_odometer is not None and end_odometer < trip.start_odometer:
+            raise Rejected(f'end_odometer is below the start odometer ({trip.start_odometer})')
+
+        trip.status = Trip.Status.COMPLETED
+        trip.end_odometer = end_odometer
+        trip.end_date = max(at, trip.start_date) if trip.start_date else at
+        trip.save(update_fields=['status', 'end_odometer', 'end_date', 'updated_at'])
+        self.changes.append(events.trip_transition(trip, Trip.Status.DISPATCHED, self.user, at))
+
+        previous_status = trip.vehicle.status
+        trip.vehicle.status = Vehicle.Status.AVAILABLE
+        # A late event must not wind back an odometer that later trips moved on
+        trip.vehicle.odometer = max(trip.vehicle.odometer, end_odometer)
+        trip.vehicle.save(update_fields=['status', 'odometer', 'updated_at'])
+        self.changes.append(events.vehicle_transition(trip.vehicle, previous_status, self.user, at))
+
+        previous_status = trip.driver.status
+        trip.driver.status = Driver.Status.OFF_DUTY
+        trip.driver.save(update_fields=['status', 'updated_at'])
+        self.changes.append(events.driver_transition(trip.driver, previous_status, self.user, at))
+        self.completed_drivers[trip.driver_id] = trip.driver
+        return {'trip': trip.pk}
+
+    def fuel(self, event):
+        trip = self.trip(event) if event.get('trip') is not None else None
+        vehicle_id = _id(event, 'vehicle')
+        amount = _decimal(event, 'amount', Expense._meta.get_field('amount'))
+        liters = _decimal(event, 'liters', Expense._meta.get_field('liters'), required=False)
+        description = event.get('description') or ''
+        at = _occurred_at(event, self.now)
+        if trip is not None:
+            if trip.status not in (Trip.Status.DISPATCHED, Trip.Status.COMPLETED):
+                raise Rejected(f'trip {trip.pk} is {trip.get_status_display()}; fuel needs a dispatched or completed trip')
+            if vehicle_id is not None and vehicle_id != trip.vehicle_id:
+                raise Rejected(f'trip {trip.pk} uses vehicle {trip.vehicle_id}, not {vehicle_id}')
+            vehicle = trip.vehicle
+        elif vehicle_id is None:
+            raise Rejected('trip or vehicle is required')
+        elif vehicle_id not in self.vehicles:
+            raise Rejected(f'vehicle {vehicle_id} does not exist')
+        else:
+            vehicle = self.vehicles[vehicle_id]
+        max_length = Expense._meta.get_field('description').max_length
+        if not isinstance(description, str) or len(description) > max_length:
+            raise Rejected(f'description must be text of at most {max_length} characters')
+
+        expense = Expense.objects.create(
+            vehicle=vehicle,
+            trip=trip,
+            expense_type=Expense.Type.FUEL,
+            amount=amount,
+            liters=liters,
+            date=at,
+            description=description,
+        )
+        return {'expense': expense.pk}
+
+    def refresh_completion_rates(self):
+        """Recompute trip_completion_rate (hot trips + archived history) of drivers whose trips completed"""
+        if not self.completed_drivers:
+            return
+        counts = {
+            row['driver_id']: row
+            for row in Trip.objects.order_by().filter(driver_id__in=self.completed_drivers)
+            .values('driver_id')
+            .annotate(total=Count('id'), completed=Count('id', filter=Q(status=Trip.Status.COMPLETED)))
+        }
+        archived = {
+            driver_id: (archived_total, archived_completed)
+            for driver_id, archived_total, archived_completed in DriverArchiveRollup.objects.filter(
+                driver_id__in=self.completed_drivers
+            ).values_list('driver_id', 'archived_trips', 'completed_trips')
+        }
+        for driver_id, driver in self.completed_drivers.items():
+            archived_total, archived_completed = archived.get(driver_id, (0, 0))
+            total = counts[driver_id]['total'] + archived_total
+            completed = counts[driver_id]['completed'] + archived_completed
+            driver.trip_completion_rate = (completed / total * 100) if total else 0
+            driver.updated_at = timezone.now()
+        Driver.objects.bulk_update(self.completed_drivers.values(), ['trip_completion_rate', 'updated_at'])
+
+
+def apply_batch(user, batch):
+    """Apply ``batch`` in order as ``user``; returns one result dict per event"""
+    _check_batch(batch)
+    now = timezone.now()
+    results = []
+    with transaction.atomic():
+        # Locking first makes a concurrent replay of the same batch wait, then see its receipts
+        trips, vehicles, _ = _lock(batch)
+        receipts = dict(
+            SyncReceipt.objects.filter(user=user, key__in=[event['id'] for event in batch]).values_list('key', 'result')
+        )
+        applier = _Batch(user, trips, vehicles, now)
+        new_receipts = []
+        for event in batch:
+            key, kind = event['id'], event.get('type')
+            if key in receipts:
+                results.append({**receipts[key], 'status': DUPLICATE})
+                continue
+            try:
+                if kind not in EVENT_PERMISSIONS:
+                    raise Rejected(f'unknown event type {kind!r}')
+                if not user.has_role_perm(EVENT_PERMISSIONS[kind]):
+                    raise Rejected(f'permission denied for {kind}')
+                result = {'id': key, 'status': APPLIED, **getattr(applier, kind)(event)}
+            except Rejected as exc:
+                results.append({'id': key, 'status': REJECTED, 'error': str(exc)})
+                continue
+            receipts[key] = result
+            results.append(result)
+            new_receipts.append(SyncReceipt(user=user, key=key, kind=kind, result=result))
+        applier.refresh_completion_rates()
+        events.record_all(applier.changes)
+        # A concurrent first delivery of the same ids fails here on the unique constraint
+        # and rolls the whole batch back; the view answers 409 and the resend gets duplicates
+        SyncReceipt.objects.bulk_create(new_receipts, batch_size=MAX_BATCH_SIZE)
+    return results
+
+
+def prune_receipts(older_than=RECEIPT_RETENTION):
+    """Delete receipts older than ``older_than``; returns the number deleted"""
+    deleted, _ = SyncReceipt.objects.filter(applied_at__lt=timezone.now() - older_than).delete()
+    return deleted
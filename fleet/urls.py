@@ -6,6 +6,7 @@ app_name = 'fleet'
 urlpatterns = [
     # Dashboard
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('search/', views.global_search, name='search'),
     
     # Authentication
     path('login/', views.FleetLoginView.as_view(), name='login'),
@@ -17,6 +18,7 @@ urlpatterns = [
     path('vehicles/create/', views.vehicle_create, name='vehicle_create'),
     path('vehicles/<int:pk>/edit/', views.vehicle_edit, name='vehicle_edit'),
     path('vehicles/<int:pk>/delete/', views.vehicle_delete, name='vehicle_delete'),
+    path('vehicles/bulk/', views.vehicle_bulk, name='vehicle_bulk'),
     
     # Trips
     path('trips/', views.trip_list, name='trip_list'),
@@ -24,17 +26,21 @@ urlpatterns = [
     path('trips/<int:pk>/dispatch/', views.trip_dispatch, name='trip_dispatch'),
     path('trips/<int:pk>/complete/', views.trip_complete, name='trip_complete'),
     path('trips/<int:pk>/cancel/', views.trip_cancel, name='trip_cancel'),
+    path('trips/bulk/', views.trip_bulk, name='trip_bulk'),
+    path('locations/autocomplete/', views.location_autocomplete, name='location_autocomplete'),
     
     # Maintenance
     path('maintenance/', views.maintenance_list, name='maintenance_list'),
     path('maintenance/create/', views.maintenance_create, name='maintenance_create'),
     path('maintenance/<int:pk>/complete/', views.maintenance_complete, name='maintenance_complete'),
+    path('maintenance/bulk/', views.maintenance_bulk, name='maintenance_bulk'),
     
     # Drivers
     path('drivers/', views.driver_list, name='driver_list'),
     path('drivers/create/', views.driver_create, name='driver_create'),
     path('drivers/<int:pk>/edit/', views.driver_edit, name='driver_edit'),
     path('drivers/<int:pk>/delete/', views.driver_delete, name='driver_delete'),
+    path('drivers/bulk/', views.driver_bulk, name='driver_bulk'),
     
     # Expenses
     path('expenses/', views.expense_list, name='expense_list'),
@@ -44,4 +50,11 @@ urlpatterns = [
     path('reports/', views.reports, name='reports'),
     path('reports/csv/', views.export_csv, name='export_csv'),
     path('reports/pdf/', views.export_pdf, name='export_pdf'),
+    path('reports/export/<slug:dataset>/', views.export_columnar, name='export_columnar'),
+    
+    # Change feed
+    path('changes/<slug:feed>/', views.change_feed, name='change_feed'),
+    
+    # Offline sync
+    path('sync/', views.sync_events, name='sync'),
 ]
@@ -0,0 +1,23 @@
+"""
+Fleet views, one module per domain.
+
+Modules import only what their own views need. Optional heavy dependencies
+(ReportLab and pypdf in ``report_builder``, numpy in ``anomalies``, pyarrow
+in ``columnar``) are imported inside the views that use them. Loading the
+URLconf - at every worker boot and ``manage.py`` command - therefore skips
+them, and the first export or expense pays the import once per process.
+``python manage.py bench_imports`` measures the cold start.
+"""
+from .accounts import FleetLoginView, logout_view, ForgotPasswordView
+from .overview import dashboard
+from .drivers import driver_list, driver_create, driver_edit, driver_delete, driver_bulk
+from .expenses import expense_list, expense_create
+from .feeds import change_feed
+from .maintenance import maintenance_list, maintenance_create, maintenance_complete, maintenance_bulk
+from .reporting import reports, export_csv, export_pdf, export_columnar
+from .search import global_search
+from .sync import sync_events
+from .trips import (
+    trip_list, trip_create, location_autocomplete, trip_dispatch, trip_complete, trip_cancel, trip_bulk,
+)
+from .vehicles import vehicle_list, vehicle_create, vehicle_edit, vehicle_delete, vehicle_bulk
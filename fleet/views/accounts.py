@@ -0,0 +1,27 @@
+"""Login, logout and password reset"""
+from django.contrib import messages
+from django.contrib.auth import logout
+from django.contrib.auth.views import LoginView, PasswordResetView
+from django.shortcuts import redirect
+
+
+class FleetLoginView(LoginView):
+    """Custom login view"""
+    template_name = 'fleet/login.html'
+    redirect_authenticated_user = True
+    
+    def get_success_url(self):
+        return '/dashboard/'
+
+
+def logout_view(request):
+    """Logout view"""
+    logout(request)
+    messages.info(request, 'You have been logged out.')
+    return redirect('fleet:login')
+
+
+class ForgotPasswordView(PasswordResetView):
+    """Forgot password view"""
+    template_name = 'fleet/forgot_password.html'
+    success_url = '/login/'
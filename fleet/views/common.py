@@ -0,0 +1,18 @@
+"""Helpers shared by the list views' bulk forms"""
+from django.contrib import messages
+from django.core.exceptions import PermissionDenied
+from django.template.defaultfilters import pluralize
+
+
+def selected_rows(request, model, perm):
+    """Rows ticked in a list view's bulk form"""
+    if not request.user.has_role_perm(perm):
+        raise PermissionDenied
+    ids = [value for value in request.POST.getlist('ids') if value.isdigit()]
+    return model.objects.filter(pk__in=ids)
+
+
+def bulk_message(request, done, skipped, noun, outcome, skip_reason):
+    messages.success(request, f'{done} {noun}{pluralize(done)} {outcome}.')
+    if skipped:
+        messages.warning(request, f'{skipped} skipped: {skip_reason}.')
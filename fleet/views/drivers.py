@@ -0,0 +1,99 @@
+"""Driver profiles"""
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.shortcuts import render, redirect, get_object_or_404
+from django.views.decorators.http import require_POST
+
+from .. import bulk, events
+from ..caching import conditional_page
+from ..models import Driver, PERM_MANAGE_DRIVERS
+from .common import selected_rows, bulk_message
+
+
+@login_required
+@conditional_page(Driver)
+def driver_list(request):
+    """List all drivers"""
+    drivers = Driver.objects.only(
+        'name', 'email', 'license_number', 'license_expiry', 'status',
+        'safety_score', 'trip_completion_rate',
+    )
+    return render(request, 'fleet/driver_list.html', {'drivers': drivers})
+
+
+@login_required
+@transaction.atomic
+def driver_create(request):
+    """Create new driver"""
+    if request.method == 'POST':
+        driver = Driver.objects.create(
+            name=request.POST.get('name'),
+            email=request.POST.get('email'),
+            phone=request.POST.get('phone'),
+            license_number=request.POST.get('license_number'),
+            license_category=request.POST.get('license_category'),
+            license_expiry=request.POST.get('license_expiry'),
+            status=request.POST.get('status', Driver.Status.OFF_DUTY)
+        )
+        events.record_driver(driver, '', request.user)
+        messages.success(request, 'Driver created successfully.')
+        return redirect('fleet:driver_list')
+    
+    return render(request, 'fleet/driver_form.html', {'title': 'Add Driver'})
+
+
+@login_required
+@transaction.atomic
+def driver_edit(request, pk):
+    """Edit driver"""
+    driver = get_object_or_404(Driver, pk=pk)
+    
+    if request.method == 'POST':
+        driver.name = request.POST.get('name')
+        driver.email = request.POST.get('email')
+        driver.phone = request.POST.get('phone')
+        driver.license_number = request.POST.get('license_number')
+        driver.license_category = request.POST.get('license_category')
+        driver.license_expiry = request.POST.get('license_expiry')
+        previous_status = driver.status
+        driver.status = request.POST.get('status')
+        driver.safety_score = float(request.POST.get('safety_score', 100))
+        driver.save()
+        events.record_driver(driver, previous_status, request.user)
+        
+        messages.success(request, 'Driver updated successfully.')
+        return redirect('fleet:driver_list')
+    
+    return render(request, 'fleet/driver_form.html', {'driver': driver, 'title': 'Edit Driver'})
+
+
+@login_required
+def driver_delete(request, pk):
+    """Delete driver"""
+    driver = get_object_or_404(Driver, pk=pk)
+    
+    if request.method == 'POST':
+        driver.delete()
+        messages.success(request, 'Driver deleted successfully.')
+        return redirect('fleet:driver_list')
+    
+    return render(request, 'fleet/driver_confirm_delete.html', {'driver': driver})
+
+
+@login_required
+@require_POST
+def driver_bulk(request):
+    """Status change or delete for the selected drivers"""
+    drivers = selected_rows(request, Driver, PERM_MANAGE_DRIVERS)
+    action = request.POST.get('action')
+    
+    if action == 'delete':
+        done, skipped = bulk.delete_drivers(drivers)
+        bulk_message(request, done, skipped, 'driver', 'deleted', 'drivers with trips are kept')
+    elif action in Driver.Status.values:
+        done, skipped = bulk.set_driver_status(drivers, action, request.user)
+        bulk_message(request, done, skipped, 'driver', f'set to {Driver.Status(action).label}', '')
+    else:
+        messages.error(request, 'Choose a bulk action.')
+    return redirect('fleet:driver_list')
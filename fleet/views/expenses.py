@@ -0,0 +1,97 @@
+"""Expense log"""
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db.models import F
+from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
+
+from ..aggregates import DecimalSum
+from ..caching import conditional_page
+from ..models import Vehicle, Trip, Expense, ExpenseAnomaly, VehicleArchiveRollup, PERM_VIEW_FINANCE
+
+
+@login_required
+@conditional_page(Expense, Vehicle, Trip, ExpenseAnomaly, VehicleArchiveRollup)
+def expense_list(request):
+    """List all expenses; amounts and per-vehicle operational cost (archive included) only for finance roles"""
+    show_finance = request.user.has_role_perm(PERM_VIEW_FINANCE)
+    fields = ['expense_type', 'liters', 'date', 'description', 'updated_at',
+              'vehicle__name', 'vehicle__license_plate', 'vehicle__updated_at']
+    anomaly = {'anomaly_score': F('anomaly__score')}
+    if show_finance:
+        fields.append('amount')
+        anomaly['anomaly_reasons'] = F('anomaly__reasons')
+    expenses = Expense.objects.select_related('vehicle').only(*fields).annotate(**anomaly)
+    flagged_only = request.GET.get('flagged') == '1'
+    if flagged_only:
+        expenses = expenses.filter(anomaly__isnull=False)
+    
+    vehicle_costs_list = []
+    if show_finance:
+        costs = dict(
+            Expense.objects.order_by()
+            .filter(expense_type__in=[Expense.Type.FUEL, Expense.Type.MAINTENANCE, Expense.Type.REPAIR])
+            .values_list('vehicle_id')
+            .annotate(total=DecimalSum('amount'))
+        )
+        archived = dict(VehicleArchiveRollup.objects.values_list('vehicle_id', 'operational_cost'))
+        vehicle_costs_list = [
+            {'vehicle': v, 'cost': costs.get(v.id, 0) + archived.get(v.id, 0)}
+            for v in Vehicle.objects.only('name')
+        ]
+    
+    return render(request, 'fleet/expense_list.html', {
+        'expenses': expenses,
+        'vehicle_costs_list': vehicle_costs_list,
+        'flagged_only': flagged_only,
+        'show_finance': show_finance,
+    })
+
+
+@login_required
+def expense_create(request):
+    """Create expense log"""
+    if request.method == 'POST':
+        vehicle_id = request.POST.get('vehicle_id')
+        trip_id = request.POST.get('trip_id') or None
+        expense_type = request.POST.get('expense_type')
+        amount = Decimal(request.POST.get('amount', 0))
+        liters = request.POST.get('liters')
+        date_str = request.POST.get('date')
+        description = request.POST.get('description', '')
+        
+        vehicle = get_object_or_404(Vehicle, pk=vehicle_id)
+        trip = get_object_or_404(Trip, pk=trip_id) if trip_id else None
+        
+        date = datetime.strptime(date_str, '%Y-%m-%d') if date_str else timezone.now()
+        
+        expense = Expense.objects.create(
+            vehicle=vehicle,
+            trip=trip,
+            expense_type=expense_type,
+            amount=amount,
+            liters=Decimal(liters) if liters else None,
+            date=date,
+            description=description
+        )
+        # numpy is only needed once an expense is saved, not at worker start
+        from .. import anomalies
+        anomaly = anomalies.score_expense(expense)
+        
+        if anomaly:
+            messages.warning(request, f'Expense logged, but flagged for review: {anomaly.reasons}.')
+        else:
+            messages.success(request, 'Expense logged successfully.')
+        return redirect('fleet:expense_list')
+    
+    vehicles = Vehicle.objects.all()
+    trips = Trip.objects.filter(status__in=[Trip.Status.DISPATCHED, Trip.Status.COMPLETED])
+    
+    return render(request, 'fleet/expense_form.html', {
+        'vehicles': vehicles,
+        'trips': trips,
+        'title': 'Log Expense'
+    })
@@ -0,0 +1,25 @@
+"""Change feed for downstream sync"""
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+
+from .. import changefeed
+
+
+@login_required
+def change_feed(request, feed):
+    """JSONL page of upserts and deletes after ``?cursor=`` for downstream sync"""
+    if feed not in changefeed.FEEDS:
+        raise Http404
+    if not request.user.has_role_perm(changefeed.FEEDS[feed][1]):
+        raise PermissionDenied
+    try:
+        limit = int(request.GET.get('limit', changefeed.DEFAULT_PAGE_SIZE))
+        page, next_cursor, has_more = changefeed.changes(feed, request.GET.get('cursor'), limit)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    
+    response = HttpResponse(changefeed.to_jsonl(page), content_type='application/x-ndjson')
+    response['X-Next-Cursor'] = next_cursor
+    response['X-Has-More'] = 'true' if has_more else 'false'
+    return response
@@ -0,0 +1,102 @@
+"""Maintenance logs"""
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from .. import bulk, events
+from ..caching import conditional_page
+from ..models import Vehicle, MaintenanceLog, PERM_MANAGE_MAINTENANCE, PERM_VIEW_FINANCE
+from .common import selected_rows, bulk_message
+
+
+@login_required
+@conditional_page(MaintenanceLog, Vehicle)
+def maintenance_list(request):
+    """List all maintenance logs; costs only for finance roles"""
+    show_finance = request.user.has_role_perm(PERM_VIEW_FINANCE)
+    fields = ['service_type', 'description', 'date', 'completed_at', 'vehicle__name', 'vehicle__license_plate']
+    if show_finance:
+        fields.append('cost')
+    logs = MaintenanceLog.objects.select_related('vehicle').only(*fields)
+    return render(request, 'fleet/maintenance_list.html', {'logs': logs, 'show_finance': show_finance})
+
+
+@login_required
+@transaction.atomic
+def maintenance_create(request):
+    """Create maintenance log - auto set vehicle to IN_SHOP"""
+    if request.method == 'POST':
+        vehicle_id = request.POST.get('vehicle_id')
+        service_type = request.POST.get('service_type')
+        description = request.POST.get('description')
+        cost = Decimal(request.POST.get('cost', 0))
+        date_str = request.POST.get('date')
+        
+        vehicle = get_object_or_404(Vehicle, pk=vehicle_id)
+        
+        # Business Logic: Set vehicle to IN_SHOP
+        previous_status = vehicle.status
+        vehicle.status = Vehicle.Status.IN_SHOP
+        vehicle.save()
+        events.record_vehicle(vehicle, previous_status, request.user)
+        
+        date = datetime.strptime(date_str, '%Y-%m-%d') if date_str else timezone.now()
+        
+        MaintenanceLog.objects.create(
+            vehicle=vehicle,
+            service_type=service_type,
+            description=description,
+            cost=cost,
+            date=date
+        )
+        
+        messages.success(request, 'Maintenance log created. Vehicle set to In Shop.')
+        return redirect('fleet:maintenance_list')
+    
+    vehicles = Vehicle.objects.all()
+    return render(request, 'fleet/maintenance_form.html', {'vehicles': vehicles, 'title': 'Add Maintenance Log'})
+
+
+@login_required
+@transaction.atomic
+def maintenance_complete(request, pk):
+    """Complete maintenance - return vehicle to available if no pending maintenance"""
+    log = get_object_or_404(MaintenanceLog, pk=pk)
+    
+    if request.method == 'POST':
+        log.completed_at = timezone.now()
+        log.save()
+        
+        # Check if vehicle has other pending maintenance
+        pending = MaintenanceLog.objects.filter(vehicle=log.vehicle, completed_at__isnull=True).exists()
+        
+        if not pending:
+            previous_status = log.vehicle.status
+            log.vehicle.status = Vehicle.Status.AVAILABLE
+            log.vehicle.save()
+            events.record_vehicle(log.vehicle, previous_status, request.user)
+        
+        messages.success(request, 'Maintenance marked complete.')
+        return redirect('fleet:maintenance_list')
+    
+    return render(request, 'fleet/maintenance_complete.html', {'log': log})
+
+
+@login_required
+@require_POST
+def maintenance_bulk(request):
+    """Complete the selected maintenance logs"""
+    logs = selected_rows(request, MaintenanceLog, PERM_MANAGE_MAINTENANCE)
+    
+    if request.POST.get('action') == 'complete':
+        done, skipped = bulk.complete_maintenance(logs, request.user)
+        bulk_message(request, done, skipped, 'maintenance log', 'marked complete', 'already completed')
+    else:
+        messages.error(request, 'Choose a bulk action.')
+    return redirect('fleet:maintenance_list')
@@ -0,0 +1,11 @@
+"""Command Center"""
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from ..dashboards import dashboard_for
+
+
+@login_required
+def dashboard(request):
+    """Command Center - KPIs for the user's role"""
+    return render(request, 'fleet/dashboard.html', dashboard_for(request.user))
@@ -0,0 +1,104 @@
+"""Analytics page and CSV / PDF / Parquet exports"""
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.shortcuts import render
+
+from ..analytics import report_range, vehicle_analytics, lane_analytics
+from ..caching import conditional_page
+from ..models import Vehicle, Trip, Expense, MaintenanceLog, Location, PERM_VIEW_FINANCE
+
+
+@login_required
+@conditional_page(Vehicle, Trip, Expense, MaintenanceLog, Location, refresh=settings.REPORT_REFRESH_SECONDS)
+def reports(request):
+    """Analytics and reports dashboard; costs only for finance roles"""
+    start, end = report_range(request.GET)
+    analytics, fleet_utilization = vehicle_analytics(start, end)
+    
+    return render(request, 'fleet/reports.html', {
+        'analytics': analytics,
+        'fleet_utilization': fleet_utilization,
+        'lanes': lane_analytics(start, end),
+        'start': start,
+        'end': end,
+        'show_finance': request.user.has_role_perm(PERM_VIEW_FINANCE),
+    })
+
+
+@login_required
+@conditional_page(Vehicle, Trip, Expense, MaintenanceLog, refresh=settings.REPORT_REFRESH_SECONDS)
+def export_csv(request):
+    """Export fleet analytics to CSV; the cost column only for finance roles"""
+    from .. import report_builder
+    start, end = report_range(request.GET)
+    analytics, fleet_utilization = vehicle_analytics(start, end)
+    finance = request.user.has_role_perm(PERM_VIEW_FINANCE)
+    
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="fleet-analytics.csv"'
+    
+    response.write(report_builder.build_csv(
+        report_builder.csv_header(start, end, fleet_utilization, finance),
+        report_builder.csv_rows(analytics, finance),
+    ))
+    
+    return response
+
+
+@login_required
+@conditional_page(Vehicle, Trip, Expense, MaintenanceLog, refresh=settings.REPORT_REFRESH_SECONDS)
+def export_pdf(request):
+    """Export fleet analytics to PDF; the cost column only for finance roles"""
+    from .. import report_builder
+    start, end = report_range(request.GET)
+    analytics, fleet_utilization = vehicle_analytics(start, end)
+    finance = request.user.has_role_perm(PERM_VIEW_FINANCE)
+    
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = 'attachment; filename="fleet-analytics.pdf"'
+    response.write(report_builder.build_pdf(
+        'FleetFlow Analytics Report',
+        f'Utilization {start:%b %d, %Y} - {end:%b %d, %Y}: fleet {fleet_utilization:.1f}%',
+        report_builder.report_rows(analytics, finance),
+        workers=settings.REPORT_WORKERS,
+        section_rows=settings.REPORT_SECTION_ROWS,
+        header=report_builder.pdf_header(finance),
+    ))
+    return response
+
+
+@login_required
+def export_columnar(request, dataset):
+    """Stream a table or the vehicle analytics as Parquet/Arrow for the data warehouse"""
+    if not request.user.has_role_perm(PERM_VIEW_FINANCE):
+        raise PermissionDenied
+    from .. import columnar
+    fmt = request.GET.get('format', 'parquet')
+    if fmt not in columnar.FORMATS or (dataset not in columnar.DATASETS and dataset != 'vehicle_analytics'):
+        raise Http404
+    try:
+        since = columnar.parse_since(request.GET.get('since'))
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    
+    content_type, extension = columnar.FORMATS[fmt]
+    until = None
+    try:
+        if dataset == 'vehicle_analytics':
+            table = columnar.analytics_table(*report_range(request.GET))
+            schema, batches = table.schema, table.to_batches()
+        else:
+            model = columnar.DATASETS[dataset]
+            until = columnar.watermark(model, since)
+            _, schema = columnar.model_schema(model)
+            batches = columnar.record_batches(model, since, until)
+    except columnar.ColumnarUnavailable as exc:
+        return HttpResponse(str(exc), status=501, content_type='text/plain')
+    
+    response = StreamingHttpResponse(columnar.stream(fmt, schema, batches), content_type=content_type)
+    if until is not None:
+        response['X-Export-Watermark'] = until.isoformat()
+    response['Content-Disposition'] = f'attachment; filename="fleet-{dataset}.{extension}"'
+    return response
@@ -0,0 +1,18 @@
+"""Global search page"""
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from .. import search
+
+
+@login_required
+def global_search(request):
+    """Vehicles, drivers and trips matching every term of the sidebar search box"""
+    query = request.GET.get('q', '').strip()
+    usable = bool(search.terms(query))
+    results = search.search(query) if usable else None
+    return render(request, 'fleet/search_results.html', {
+        'query': query,
+        'results': results,
+        'min_term_length': search.MIN_TERM_LENGTH,
+    })
@@ -0,0 +1,31 @@
+"""Offline event sync for drivers' devices"""
+import json
+
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from .. import sync
+
+
+def _error(message, status, **extra):
+    return JsonResponse({'error': message, **extra}, status=status)
+
+
+@require_POST
+def sync_events(request):
+    """Apply a JSON batch of offline trip and fuel events; replayed ids are answered from their receipts"""
+    # Devices are API clients: answer in JSON rather than redirecting to the login page
+    if not request.user.is_authenticated:
+        return _error('Authentication required.', 401)
+    if not any(request.user.has_role_perm(perm) for perm in set(sync.EVENT_PERMISSIONS.values())):
+        return _error('Your role cannot sync trip or fuel events.', 403)
+    try:
+        payload = json.loads(request.body)
+        results = sync.apply_batch(request.user, payload.get('events') if isinstance(payload, dict) else None)
+    except ValueError as exc:
+        return _error(str(exc), 400)
+    except IntegrityError:
+        # Another request delivered some of these ids first; a resend gets their receipts
+        return _error('A concurrent request applied some of these events. Resend the batch.', 409, retry=True)
+    return JsonResponse({'results': results})
@@ -0,0 +1,226 @@
+"""Trip lifecycle: create, dispatch, complete, cancel"""
+from decimal import Decimal
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.db.models import Count, Q
+from django.http import JsonResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from .. import bulk, events
+from ..caching import conditional_page
+from ..models import Vehicle, Driver, Trip, Location, DriverArchiveRollup, PERM_MANAGE_TRIPS
+from .common import selected_rows, bulk_message
+
+
+@login_required
+@conditional_page(Trip, Vehicle, Driver)
+def trip_list(request):
+    """List all trips"""
+    trips = Trip.objects.select_related('vehicle', 'driver').only(
+        'origin', 'destination', 'cargo_weight', 'status', 'updated_at',
+        'vehicle__name', 'vehicle__license_plate', 'vehicle__updated_at', 'driver__name', 'driver__updated_at',
+    )
+    
+    status = request.GET.get('status')
+    if status:
+        trips = trips.filter(status=status)
+    
+    return render(request, 'fleet/trip_list.html', {'trips': trips})
+
+
+@login_required
+def trip_create(request):
+    """Create new trip with validation"""
+    if request.method == 'POST':
+        vehicle_id = request.POST.get('vehicle_id')
+        driver_id = request.POST.get('driver_id')
+        cargo_weight = Decimal(request.POST.get('cargo_weight', 0))
+        origin = request.POST.get('origin')
+        destination = request.POST.get('destination')
+        
+        vehicle = get_object_or_404(Vehicle, pk=vehicle_id)
+        driver = get_object_or_404(Driver, pk=driver_id)
+        
+        # Business Logic: Validate cargo weight
+        if cargo_weight > vehicle.max_load_capacity:
+            messages.error(request, f'Cargo weight ({cargo_weight}kg) exceeds vehicle capacity ({vehicle.max_load_capacity}kg)')
+            return redirect('fleet:trip_create')
+        
+        if vehicle.status != Vehicle.Status.AVAILABLE:
+            messages.error(request, 'Vehicle is not available')
+            return redirect('fleet:trip_create')
+        
+        # Business Logic: Check driver license
+        if driver.is_license_expired:
+            messages.error(request, 'Driver license has expired')
+            return redirect('fleet:trip_create')
+        
+        if driver.status != Driver.Status.ON_DUTY:
+            messages.error(request, 'Driver is not available')
+            return redirect('fleet:trip_create')
+        
+        origin_location = Location.objects.resolve(origin)
+        destination_location = Location.objects.resolve(destination)
+        trip = Trip.objects.create(
+            vehicle=vehicle,
+            driver=driver,
+            cargo_weight=cargo_weight,
+            origin=origin_location.name,
+            destination=destination_location.name,
+            origin_location=origin_location,
+            destination_location=destination_location,
+            status=Trip.Status.DRAFT
+        )
+        events.record_trip(trip, '', request.user)
+        messages.success(request, 'Trip created successfully.')
+        return redirect('fleet:trip_list')
+    
+    vehicles = Vehicle.objects.filter(status=Vehicle.Status.AVAILABLE, is_out_of_service=False)
+    drivers = Driver.objects.filter(status=Driver.Status.ON_DUTY, license_expiry__gt=timezone.now().date())
+    
+    return render(request, 'fleet/trip_form.html', {
+        'vehicles': vehicles,
+        'drivers': drivers,
+        'title': 'Create Trip'
+    })
+
+
+@login_required
+def location_autocomplete(request):
+    """Origin/destination suggestions for the trip form"""
+    names = Location.objects.prefix_search(request.GET.get('q', '')).values_list('name', flat=True)
+    return JsonResponse({'results': list(names)})
+
+
+@login_required
+@transaction.atomic
+def trip_dispatch(request, pk):
+    """Dispatch trip - update vehicle and driver status"""
+    trip = get_object_or_404(Trip, pk=pk)
+    
+    if trip.status != Trip.Status.DRAFT:
+        messages.error(request, 'Only draft trips can be dispatched.')
+        return redirect('fleet:trip_list')
+    
+    if request.method == 'POST':
+        start_odometer = Decimal(request.POST.get('start_odometer', 0))
+        
+        trip.status = Trip.Status.DISPATCHED
+        trip.start_odometer = start_odometer
+        trip.start_date = timezone.now()
+        trip.save()
+        changes = [events.trip_transition(trip, Trip.Status.DRAFT, request.user)]
+        
+        previous_status = trip.vehicle.status
+        trip.vehicle.status = Vehicle.Status.ON_TRIP
+        trip.vehicle.save()
+        changes.append(events.vehicle_transition(trip.vehicle, previous_status, request.user))
+        
+        previous_status = trip.driver.status
+        trip.driver.status = Driver.Status.ON_DUTY
+        trip.driver.save()
+        changes.append(events.driver_transition(trip.driver, previous_status, request.user))
+        events.record_all(changes)
+        
+        messages.success(request, 'Trip dispatched successfully.')
+        return redirect('fleet:trip_list')
+    
+    return render(request, 'fleet/trip_dispatch.html', {'trip': trip})
+
+
+@login_required
+@transaction.atomic
+def trip_complete(request, pk):
+    """Complete trip - update vehicle/driver back to available"""
+    trip = get_object_or_404(Trip, pk=pk)
+    
+    if trip.status != Trip.Status.DISPATCHED:
+        messages.error(request, 'Only dispatched trips can be completed.')
+        return redirect('fleet:trip_list')
+    
+    if request.method == 'POST':
+        end_odometer = Decimal(request.POST.get('end_odometer', 0))
+        
+        trip.status = Trip.Status.COMPLETED
+        trip.end_odometer = end_odometer
+        trip.end_date = timezone.now()
+        trip.save()
+        changes = [events.trip_transition(trip, Trip.Status.DISPATCHED, request.user)]
+        
+        previous_status = trip.vehicle.status
+        trip.vehicle.status = Vehicle.Status.AVAILABLE
+        trip.vehicle.odometer = end_odometer
+        trip.vehicle.save()
+        changes.append(events.vehicle_transition(trip.vehicle, previous_status, request.user))
+        
+        previous_status = trip.driver.status
+        trip.driver.status = Driver.Status.OFF_DUTY
+        trip.driver.save()
+        changes.append(events.driver_transition(trip.driver, previous_status, request.user))
+        events.record_all(changes)
+        
+        # Update driver completion rate (hot trips + archived history)
+        counts = Trip.objects.filter(driver=trip.driver).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status=Trip.Status.COMPLETED)),
+        )
+        archived_total, archived_completed = DriverArchiveRollup.objects.filter(driver=trip.driver).values_list(
+            'archived_trips', 'completed_trips'
+        ).first() or (0, 0)
+        total = counts['total'] + archived_total
+        completed = counts['completed'] + archived_completed
+        trip.driver.trip_completion_rate = (completed / total * 100) if total else 0
+        trip.driver.save()
+        
+        messages.success(request, 'Trip completed successfully.')
+        return redirect('fleet:trip_list')
+    
+    return render(request, 'fleet/trip_complete.html', {'trip': trip})
+
+
+@login_required
+@transaction.atomic
+def trip_cancel(request, pk):
+    """Cancel trip"""
+    trip = get_object_or_404(Trip, pk=pk)
+    
+    if request.method == 'POST':
+        previous_status = trip.status
+        was_dispatched = trip.status == Trip.Status.DISPATCHED
+        trip.status = Trip.Status.CANCELLED
+        trip.save()
+        changes = [events.trip_transition(trip, previous_status, request.user)]
+        
+        if was_dispatched:
+            previous_status = trip.vehicle.status
+            trip.vehicle.status = Vehicle.Status.AVAILABLE
+            trip.vehicle.save()
+            changes.append(events.vehicle_transition(trip.vehicle, previous_status, request.user))
+            previous_status = trip.driver.status
+            trip.driver.status = Driver.Status.OFF_DUTY
+            trip.driver.save()
+            changes.append(events.driver_transition(trip.driver, previous_status, request.user))
+        events.record_all(changes)
+        
+        messages.success(request, 'Trip cancelled successfully.')
+        return redirect('fleet:trip_list')
+    
+    return render(request, 'fleet/trip_confirm_cancel.html', {'trip': trip})
+
+
+@login_required
+@require_POST
+def trip_bulk(request):
+    """Cancel the selected trips"""
+    trips = selected_rows(request, Trip, PERM_MANAGE_TRIPS)
+    
+    if request.POST.get('action') == 'cancel':
+        done, skipped = bulk.cancel_trips(trips, request.user)
+        bulk_message(request, done, skipped, 'trip', 'cancelled', 'only draft and dispatched trips can be cancelled')
+    else:
+        messages.error(request, 'Choose a bulk action.')
+    return redirect('fleet:trip_list')
@@ -0,0 +1,116 @@
+"""Vehicle registry"""
+from decimal import Decimal
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.shortcuts import render, redirect, get_object_or_404
+from django.views.decorators.http import require_POST
+
+from .. import bulk, events
+from ..caching import conditional_page
+from ..models import Vehicle, PERM_MANAGE_VEHICLES
+from .common import selected_rows, bulk_message
+
+
+@login_required
+@conditional_page(Vehicle)
+def vehicle_list(request):
+    """List all vehicles with filters"""
+    vehicles = Vehicle.objects.only(
+        'name', 'model_name', 'license_plate', 'vehicle_type', 'max_load_capacity',
+        'odometer', 'status', 'updated_at',
+    )
+    
+    vehicle_type = request.GET.get('vehicle_type')
+    status = request.GET.get('status')
+    
+    if vehicle_type:
+        vehicles = vehicles.filter(vehicle_type=vehicle_type)
+    if status:
+        vehicles = vehicles.filter(status=status)
+    
+    return render(request, 'fleet/vehicle_list.html', {'vehicles': vehicles})
+
+
+@login_required
+@transaction.atomic
+def vehicle_create(request):
+    """Create new vehicle"""
+    if request.method == 'POST':
+        name = request.POST.get('name')
+        model_name = request.POST.get('model_name')
+        license_plate = request.POST.get('license_plate')
+        vehicle_type = request.POST.get('vehicle_type')
+        max_load_capacity = Decimal(request.POST.get('max_load_capacity', 0))
+        odometer = Decimal(request.POST.get('odometer', 0))
+        
+        vehicle = Vehicle.objects.create(
+            name=name,
+            model_name=model_name,
+            license_plate=license_plate,
+            vehicle_type=vehicle_type,
+            max_load_capacity=max_load_capacity,
+            odometer=odometer
+        )
+        events.record_vehicle(vehicle, '', request.user)
+        messages.success(request, 'Vehicle created successfully.')
+        return redirect('fleet:vehicle_list')
+    
+    return render(request, 'fleet/vehicle_form.html', {'title': 'Add Vehicle'})
+
+
+@login_required
+@transaction.atomic
+def vehicle_edit(request, pk):
+    """Edit existing vehicle"""
+    vehicle = get_object_or_404(Vehicle, pk=pk)
+    
+    if request.method == 'POST':
+        vehicle.name = request.POST.get('name')
+        vehicle.model_name = request.POST.get('model_name')
+        vehicle.license_plate = request.POST.get('license_plate')
+        vehicle.vehicle_type = request.POST.get('vehicle_type')
+        vehicle.max_load_capacity = Decimal(request.POST.get('max_load_capacity', 0))
+        vehicle.odometer = Decimal(request.POST.get('odometer', 0))
+        previous_status = vehicle.status
+        vehicle.status = request.POST.get('status')
+        vehicle.is_out_of_service = request.POST.get('is_out_of_service') == 'on'
+        vehicle.save()
+        events.record_vehicle(vehicle, previous_status, request.user)
+        
+        messages.success(request, 'Vehicle updated successfully.')
+        return redirect('fleet:vehicle_list')
+    
+    return render(request, 'fleet/vehicle_form.html', {'vehicle': vehicle, 'title': 'Edit Vehicle'})
+
+
+@login_required
+def vehicle_delete(request, pk):
+    """Delete vehicle"""
+    vehicle = get_object_or_404(Vehicle, pk=pk)
+    
+    if request.method == 'POST':
+        vehicle.delete()
+        messages.success(request, 'Vehicle deleted successfully.')
+        return redirect('fleet:vehicle_list')
+    
+    return render(request, 'fleet/vehicle_confirm_delete.html', {'vehicle': vehicle})
+
+
+@login_required
+@require_POST
+def vehicle_bulk(request):
+    """Status change or delete for the selected vehicles"""
+    vehicles = selected_rows(request, Vehicle, PERM_MANAGE_VEHICLES)
+    action = request.POST.get('action')
+    
+    if action == 'delete':
+        done, skipped = bulk.delete_vehicles(vehicles)
+        bulk_message(request, done, skipped, 'vehicle', 'deleted', 'vehicles with trips are kept')
+    elif action in bulk.VEHICLE_STATUSES:
+        done, skipped = bulk.set_vehicle_status(vehicles, action, request.user)
+        bulk_message(request, done, skipped, 'vehicle', f'set to {Vehicle.Status(action).label}', 'vehicles on a trip')
+    else:
+        messages.error(request, 'Choose a bulk action.')
+    return redirect('fleet:vehicle_list')
@@ -37,22 +37,54 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'fleetflow.urls'
 WSGI_APPLICATION = 'fleetflow.wsgi.application'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'fleet.context_processors.navigation',
+                'fleet.context_processors.logo',
+            ],
+            # Compiled templates are kept in memory in production; in DEBUG
+            # they are re-read from disk so edits show up without a restart.
+            'loaders': TEMPLATE_LOADERS if DEBUG else [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
             ],
         },
     },
 ]
 
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://fleetflow'),
+    # {% cache %} uses this alias; rows of a 10k-row page must all fit
+    'template_fragments': env.cache('FRAGMENT_CACHE_URL', default='locmemcache://fleetflow-fragments'),
+}
+if CACHES['template_fragments']['BACKEND'].endswith('LocMemCache'):
+    CACHES['template_fragments'].setdefault('OPTIONS', {}).setdefault('MAX_ENTRIES', 100000)
+
+# Seconds a rendered list/report page is kept per user (keyed on its ETag)
+PAGE_CACHE_TIMEOUT = env.int('PAGE_CACHE_TIMEOUT', default=300)
+# Utilization on the reports page runs up to "now", so its ETag also rolls over this often
+REPORT_REFRESH_SECONDS = env.int('REPORT_REFRESH_SECONDS', default=300)
+
+# Processes used to render PDF export sections; 1 keeps rendering in the request process
+REPORT_WORKERS = env.int('REPORT_WORKERS', default=1)
+# Vehicles per export section (and per PDF table)
+REPORT_SECTION_ROWS = env.int('REPORT_SECTION_ROWS', default=2000)
+
+# Change-feed rows younger than this are held back until their transactions have surely committed
+CHANGE_FEED_SETTLE_SECONDS = env.int('CHANGE_FEED_SETTLE_SECONDS', default=5)
+
 DATABASES = {
     'default': env.db(
         'DATABASE_URL',
@@ -61,6 +93,17 @@ DATABASES = {
 }
 
 AUTH_USER_MODEL = 'fleet.User'
+AUTHENTICATION_BACKENDS = ['fleet.auth.CachedModelBackend']
+# Upper bound on how long a cached user row may be served; saves invalidate it immediately
+USER_CACHE_TIMEOUT = env.int('USER_CACHE_TIMEOUT', default=300)
+
+# Production reads sessions from the cache and falls back to the DB on a miss.
+# Set SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies to avoid
+# server-side session storage entirely.
+SESSION_ENGINE = env(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.db' if DEBUG else 'django.contrib.sessions.backends.cached_db',
+)
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -81,6 +124,21 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# collectstatic fingerprints every file (app.3f2a1c.css) and writes gzip and
+# brotli copies next to it; WhiteNoise serves the hashed names with a
+# one-year immutable Cache-Control. DEBUG keeps plain names so no
+# collectstatic run is needed in development.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='FleetFlow <noreply@fleetflow.com>')
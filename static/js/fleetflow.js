@@ -0,0 +1,141 @@
+/* FleetFlow - sidebar and form behaviour */
+
+document.addEventListener('DOMContentLoaded', function() {
+  const sidebarToggle = document.getElementById('sidebarToggle');
+  const sidebar = document.getElementById('sidebar');
+  const sidebarOverlay = document.getElementById('sidebarOverlay');
+  
+  if (sidebarToggle && sidebar && sidebarOverlay) {
+    const closeSidebar = document.getElementById('closeSidebar');
+    
+    function openSidebar() {
+      sidebar.classList.add('show');
+      sidebarOverlay.classList.add('show');
+    }
+    
+    function closeSidebarFunc() {
+      sidebar.classList.remove('show');
+      sidebarOverlay.classList.remove('show');
+    }
+    
+    sidebarToggle.addEventListener('click', function(e) {
+      e.stopPropagation();
+      openSidebar();
+    });
+    
+    if (closeSidebar) {
+      closeSidebar.addEventListener('click', function(e) {
+        e.stopPropagation();
+        closeSidebarFunc();
+      });
+    }
+    
+    sidebarOverlay.addEventListener('click', function() {
+      closeSidebarFunc();
+    });
+    
+    document.addEventListener('click', function(e) {
+      if (window.innerWidth < 768) {
+        if (!sidebar.contains(e.target) && !sidebarToggle.contains(e.target)) {
+          closeSidebarFunc();
+        }
+      }
+    });
+    
+    sidebar.addEventListener('click', function(e) {
+      e.stopPropagation();
+    });
+    
+    document.addEventListener('keydown', function(e) {
+      if (e.key === 'Escape' && sidebar.classList.contains('show')) {
+        closeSidebarFunc();
+      }
+    });
+  }
+  
+  document.querySelectorAll('.nav-section-header').forEach(header => {
+    header.addEventListener('click', function(e) {
+      e.preventDefault();
+      e.stopPropagation();
+      const targetId = this.getAttribute('data-target');
+      const target = document.querySelector(targetId);
+      
+      if (target) {
+        const isExpanded = this.classList.contains('not') && !this.classList.contains('collapsed');
+        const bsCollapse = new bootstrap.Collapse(target, { toggle: false });
+        
+        if (isExpanded) {
+          bsCollapse.hide();
+          this.classList.add('collapsed');
+          this.classList.remove('not');
+        } else {
+          bsCollapse.show();
+          this.classList.remove('collapsed');
+          this.classList.add('not');
+        }
+      }
+    });
+  });
+
+  // Trip form: show the selected vehicle's max capacity under the cargo field
+  const vehicleSelect = document.getElementById('vehicle_id');
+  const maxCapacity = document.getElementById('maxCapacity');
+  if (vehicleSelect && maxCapacity) {
+    vehicleSelect.addEventListener('change', function() {
+      const selected = this.options[this.selectedIndex];
+      const maxCap = selected.text.match(/Max: (\d+\.?\d*)kg/);
+      maxCapacity.textContent = maxCap ? 'Max capacity: ' + maxCap[1] + 'kg' : '';
+    });
+  }
+
+  // Trip form: suggest known origins/destinations as the user types
+  const locationOptions = document.getElementById('locationOptions');
+  if (locationOptions) {
+    let pending = null;
+    document.querySelectorAll('input[data-autocomplete-url]').forEach(input => {
+      input.addEventListener('input', function() {
+        clearTimeout(pending);
+        const query = this.value.trim();
+        if (query.length < 2) {
+          return;
+        }
+        const url = this.dataset.autocompleteUrl + '?q=' + encodeURIComponent(query);
+        pending = setTimeout(function() {
+          fetch(url, { credentials: 'same-origin' })
+            .then(response => response.ok ? response.json() : { results: [] })
+            .then(data => {
+              locationOptions.replaceChildren(...data.results.map(name => {
+                const option = document.createElement('option');
+                option.value = name;
+                return option;
+              }));
+            })
+            .catch(() => {});
+        }, 150);
+      });
+    });
+  }
+
+  // List views: header checkbox selects every row of its bulk form
+  document.querySelectorAll('input[data-bulk-toggle]').forEach(toggle => {
+    toggle.addEventListener('change', function() {
+      document.querySelectorAll('input[name="ids"][form="' + this.dataset.bulkToggle + '"]').forEach(box => {
+        box.checked = toggle.checked;
+      });
+    });
+  });
+
+  // List views: bulk forms need a selection, and destructive actions ask first
+  document.querySelectorAll('form[data-bulk-form]').forEach(form => {
+    form.addEventListener('submit', function(e) {
+      const selected = document.querySelectorAll('input[name="ids"][form="' + form.id + '"]:checked').length;
+      const option = form.elements.action.selectedOptions[0];
+      if (!selected) {
+        e.preventDefault();
+        alert('Select at least one row first.');
+      } else if (option && option.dataset.confirm && !confirm(option.dataset.confirm + ' (' + selected + ' selected)')) {
+        e.preventDefault();
+      }
+    });
+  });
+});